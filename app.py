@@ -1,15 +1,31 @@
+from dotenv import load_dotenv
+
+load_dotenv()
+
 from src.database.database import db
 from flask import Flask
+from src.controllers.metrics import metrics_blueprint
 from src.controllers.ping import ping_blueprint
 from src.controllers.reset import reset_blueprint
 from src.controllers.route import route_blueprint
-from dotenv import load_dotenv
+from src.web import compression, timing
+from src.web.json_provider import FastJSONProvider
 
-load_dotenv()
+def create_app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    timing.init_app(app)
+    compression.init_app(app)
+    app.register_blueprint(ping_blueprint)
+    app.register_blueprint(metrics_blueprint)
+    app.register_blueprint(reset_blueprint)
+    app.register_blueprint(route_blueprint)
+    db.init_app(app)
+    app.cli.command('init-db', help='Crea la base de datos y las tablas si no existen.')(init_db)
+    return app
+
+def init_db():
+    db.create_all()
 
-app = Flask(__name__)
-app.register_blueprint(ping_blueprint)
-app.register_blueprint(reset_blueprint)
-app.register_blueprint(route_blueprint)
-db.create_all()
+app = create_app()
 #app.run(debug=True) 
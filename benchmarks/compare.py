@@ -0,0 +1,45 @@
+import argparse
+import json
+
+
+def load(path):
+    with open(path) as file:
+        report = json.load(file)
+    return report, {(r["scenario"], r["dataset"], r["concurrency"]): r for r in report["results"]}
+
+def change(before, after):
+    if not before or after is None:
+        return None
+    return round((after - before) / before * 100, 1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara dos reportes de benchmarks.load_test')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    args = parser.parse_args()
+
+    baseline_report, baseline = load(args.baseline)
+    candidate_report, candidate = load(args.candidate)
+    rows = []
+    for key, result in candidate.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        scenario, dataset, concurrency = key
+        rows.append({
+            "scenario": scenario,
+            "dataset": dataset,
+            "concurrency": concurrency,
+            "throughputChangePct": change(before["throughput"], result["throughput"]),
+            "p50ChangePct": change(before["p50Ms"], result["p50Ms"]),
+            "p95ChangePct": change(before["p95Ms"], result["p95Ms"]),
+            "p99ChangePct": change(before["p99Ms"], result["p99Ms"])
+        })
+    print(json.dumps({
+        "baseline": baseline_report["commit"],
+        "candidate": candidate_report["commit"],
+        "results": rows
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from src.web import json_provider
+from src.web.json_provider import FastJSONProvider
+
+
+def build_routes(count):
+    now = datetime.now()
+    return [{
+        "id": str(uuid.uuid4()),
+        "flightId": f"FL{i:06d}",
+        "sourceAirportCode": "BOG",
+        "sourceCountry": "Colombia",
+        "destinyAirportCode": "MIA",
+        "destinyCountry": "Estados Unidos",
+        "bagCost": 50.0,
+        "plannedStartDate": now + timedelta(days=1),
+        "plannedEndDate": now + timedelta(days=2),
+        "createdAt": now
+    } for i in range(count)]
+
+def measure(provider_class, routes, repeat):
+    app = Flask(__name__)
+    app.json = provider_class(app)
+    timings = []
+    with app.app_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = app.json.response(routes)
+            timings.append(time.perf_counter() - start)
+    return {"bestMs": min(timings) * 1000, "bytes": len(response.get_data())}
+
+def main():
+    parser = argparse.ArgumentParser(description='Serialización de GET /routes con cada proveedor JSON')
+    parser.add_argument('--routes', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    routes = build_routes(args.routes)
+    results = {
+        "routes": args.routes,
+        "encoder": "orjson" if json_provider.orjson is not None else "json",
+        "flaskDefault": measure(DefaultJSONProvider, routes, args.repeat),
+        "fast": measure(FastJSONProvider, routes, args.repeat)
+    }
+    results["speedup"] = results["flaskDefault"]["bestMs"] / results["fast"]["bestMs"]
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+from .users_stub import start_users_stub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEADERS = {'Authorization': 'Bearer bench-token'}
+SEED_CHUNK = 1000
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def route_payload(flight_id):
+    start = datetime.now() + timedelta(days=30)
+    return {
+        "flightId": flight_id,
+        "sourceAirportCode": "BOG",
+        "sourceCountry": "Colombia",
+        "destinyAirportCode": "MIA",
+        "destinyCountry": "Estados Unidos",
+        "bagCost": 50,
+        "plannedStartDate": start.isoformat(),
+        "plannedEndDate": (start + timedelta(hours=4)).isoformat()
+    }
+
+
+class Server:
+
+    def __init__(self, args, users_url):
+        self.args = args
+        self.port = free_port()
+        self.base_url = f'http://127.0.0.1:{self.port}'
+        self.env = dict(os.environ, USERS_PATH=users_url, DB_URI=args.db_uri)
+        self.env.pop('is_test', None)
+        self.process = None
+
+    def __enter__(self):
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'], cwd=ROOT, env=self.env, check=True)
+        command = [
+            sys.executable, '-m', 'gunicorn',
+            '-b', f'127.0.0.1:{self.port}',
+            '-w', str(self.args.workers),
+            '-k', self.args.worker_class,
+            '--threads', str(self.args.threads),
+            'app:app'
+        ]
+        self.process = subprocess.Popen(command, cwd=ROOT, env=self.env,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                if requests.get(f'{self.base_url}/routes/ping', timeout=1).status_code == 200:
+                    return self
+            except requests.RequestException:
+                time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError('gunicorn no respondió en 30 segundos')
+
+    def __exit__(self, *exc):
+        if self.process:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+
+
+class Driver:
+
+    def __init__(self, base_url, concurrency):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.local = threading.local()
+
+    def session(self):
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+            self.local.session.headers.update(HEADERS)
+        return self.local.session
+
+    def timed(self, method, path, payload):
+        started_at = time.perf_counter()
+        response = self.session().request(method, f'{self.base_url}{path}', json=payload)
+        response.content
+        return time.perf_counter() - started_at, response.status_code < 400
+
+    def run(self, name, requests_list):
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            started_at = time.perf_counter()
+            results = list(executor.map(lambda item: self.timed(*item), requests_list))
+            elapsed = time.perf_counter() - started_at
+        latencies = sorted(latency for latency, _ in results)
+        return {
+            "scenario": name,
+            "concurrency": self.concurrency,
+            "requests": len(results),
+            "errors": sum(1 for _, ok in results if not ok),
+            "throughput": len(results) / elapsed if elapsed else None,
+            "p50Ms": percentile(latencies, 0.50) * 1000,
+            "p95Ms": percentile(latencies, 0.95) * 1000,
+            "p99Ms": percentile(latencies, 0.99) * 1000
+        }
+
+
+def seed(base_url, dataset, prefix):
+    ids = []
+    for start in range(0, dataset, SEED_CHUNK):
+        items = [route_payload(f'{prefix}{i:07d}') for i in range(start, min(dataset, start + SEED_CHUNK))]
+        response = requests.post(f'{base_url}/routes/batch', json=items, headers=HEADERS)
+        response.raise_for_status()
+        ids.extend(result["id"] for result in response.json()["results"] if result["status"] == 201)
+    return ids
+
+def run_dataset(server, dataset, concurrency, count):
+    requests.post(f'{server.base_url}/routes/reset').raise_for_status()
+    ids = seed(server.base_url, dataset, f'S{concurrency}-')
+    driver = Driver(server.base_url, concurrency)
+    driver.run('warmup', [('GET', '/routes/ping', None)] * concurrency)
+    creates = [('POST', '/routes', route_payload(f'C{concurrency}-{i:07d}')) for i in range(count)]
+    lists = [('GET', '/routes', None)] * max(1, count // 10)
+    pages = [('GET', '/routes?limit=100', None)] * count
+    gets = [('GET', f'/routes/{ids[i % len(ids)]}', None) for i in range(count)] if ids else []
+    deletes = [('DELETE', f'/routes/{route_id}', None) for route_id in ids[:count]]
+    results = []
+    for name, requests_list in (('POST /routes', creates), ('GET /routes', lists),
+                                ('GET /routes?limit=100', pages), ('GET /routes/<id>', gets),
+                                ('DELETE /routes/<id>', deletes)):
+        if requests_list:
+            result = driver.run(name, requests_list)
+            result["dataset"] = dataset
+            results.append(result)
+    return results
+
+def parse_list(value):
+    return [int(item) for item in value.split(',') if item]
+
+def main():
+    parser = argparse.ArgumentParser(description='Pruebas de carga del microservicio de trayectos')
+    parser.add_argument('--db-uri', default=None, help='URI de base de datos; por defecto un archivo SQLite temporal')
+    parser.add_argument('--concurrency', type=parse_list, default=[1, 8, 32])
+    parser.add_argument('--datasets', type=parse_list, default=[1000, 10000])
+    parser.add_argument('--requests', type=int, default=500, help='Solicitudes por escenario')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--worker-class', default='sync')
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--users-latency-ms', type=float, default=0)
+    parser.add_argument('--output', help='Archivo donde guardar el resultado JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if not args.db_uri:
+            args.db_uri = f'sqlite:///{os.path.join(directory, "bench.db")}'
+        users = start_users_stub(latency_ms=args.users_latency_ms)
+        results = []
+        try:
+            with Server(args, f'http://127.0.0.1:{users.server_port}') as server:
+                for dataset in args.datasets:
+                    for concurrency in args.concurrency:
+                        results.extend(run_dataset(server, dataset, concurrency, args.requests))
+        finally:
+            users.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "database": args.db_uri.split(':', 1)[0],
+        "workers": args.workers,
+        "workerClass": args.worker_class,
+        "threads": args.threads,
+        "usersLatencyMs": args.users_latency_ms,
+        "requestsPerScenario": args.requests,
+        "results": results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
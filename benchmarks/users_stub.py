@@ -0,0 +1,43 @@
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class UsersStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        authorized = self.path == '/users/me' and self.headers.get('Authorization', '').startswith('Bearer ')
+        body = b'{"id":"bench-user"}' if authorized else b'{}'
+        self.send_response(200 if authorized else 401)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_users_stub(port=0, latency_ms=0):
+    handler = type('Handler', (UsersStubHandler,), {'latency': latency_ms / 1000})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Stub local del microservicio de Usuarios')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    args = parser.parse_args()
+    server = start_users_stub(args.port, args.latency_ms)
+    print(f'Users stub en http://127.0.0.1:{server.server_port}')
+    threading.Event().wait()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import json
+import os
+import tempfile
+
+from .load_test import Server, git_commit, run_dataset
+from .users_stub import start_users_stub
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara workers sync de gunicorn con workers concurrentes')
+    parser.add_argument('--db-uri', default=None)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--concurrent-class', default='gthread', help='gthread o gevent')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--dataset', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--users-latency-ms', type=float, default=20)
+    args = parser.parse_args()
+
+    os.environ['USERS_TOKEN_CACHE_MAX_SIZE'] = '0'
+    modes = [('sync', 1), (args.concurrent_class, args.threads)]
+    report = {"commit": git_commit(), "usersLatencyMs": args.users_latency_ms, "modes": {}}
+    users = start_users_stub(latency_ms=args.users_latency_ms)
+    try:
+        for worker_class, threads in modes:
+            with tempfile.TemporaryDirectory() as directory:
+                mode_args = argparse.Namespace(
+                    db_uri=args.db_uri or f'sqlite:///{os.path.join(directory, "bench.db")}',
+                    workers=args.workers, worker_class=worker_class, threads=threads)
+                with Server(mode_args, f'http://127.0.0.1:{users.server_port}') as server:
+                    results = run_dataset(server, args.dataset, args.concurrency, args.requests)
+            report["modes"][worker_class] = {"threads": threads, "results": results}
+    finally:
+        users.shutdown()
+
+    report["throughputGain"] = {
+        result["scenario"]: result["throughput"] / baseline["throughput"]
+        for baseline, result in zip(report["modes"]["sync"]["results"],
+                                    report["modes"][args.concurrent_class]["results"])
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
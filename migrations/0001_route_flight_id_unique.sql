@@ -0,0 +1,3 @@
+-- Índice único sobre route."flightId" para tablas creadas antes de que el modelo lo declarara.
+-- Falla si ya existen flightId duplicados: elimínalos antes de ejecutar este script.
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "ix_route_flightId" ON route ("flightId");
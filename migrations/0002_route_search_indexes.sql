@@ -0,0 +1,6 @@
+-- Índices compuestos para los filtros de búsqueda de GET /routes en tablas ya existentes.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_route_source_airport_start ON route ("sourceAirportCode", "plannedStartDate");
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_route_destiny_airport_start ON route ("destinyAirportCode", "plannedStartDate");
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_route_source_country_start ON route ("sourceCountry", "plannedStartDate");
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_route_destiny_country_start ON route ("destinyCountry", "plannedStartDate");
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_route_planned_start ON route ("plannedStartDate");
@@ -0,0 +1,12 @@
+-- Convierte route.id a uuid nativo y las fechas a timestamptz en tablas ya existentes.
+-- Las fechas se guardaban sin zona horaria y en UTC. Ajusta 'UTC' si createdAt/updateAt
+-- se generaron con otra zona horaria. Falla si algún id no tiene formato uuid.
+-- Reescribe la tabla, así que ejecútalo en una ventana de mantenimiento.
+BEGIN;
+ALTER TABLE route
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN "plannedStartDate" TYPE timestamptz USING "plannedStartDate" AT TIME ZONE 'UTC',
+    ALTER COLUMN "plannedEndDate" TYPE timestamptz USING "plannedEndDate" AT TIME ZONE 'UTC',
+    ALTER COLUMN "createdAt" TYPE timestamptz USING "createdAt" AT TIME ZONE 'UTC',
+    ALTER COLUMN "updateAt" TYPE timestamptz USING "updateAt" AT TIME ZONE 'UTC';
+COMMIT;
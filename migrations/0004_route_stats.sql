@@ -0,0 +1,18 @@
+-- Crea la tabla de estadísticas por par de aeropuertos de GET /routes/stats y la
+-- llena con los trayectos existentes. A partir de aquí el servicio la mantiene al
+-- crear, borrar y reiniciar trayectos.
+BEGIN;
+CREATE TABLE IF NOT EXISTS route_stats (
+    "sourceAirportCode" VARCHAR NOT NULL,
+    "destinyAirportCode" VARCHAR NOT NULL,
+    count BIGINT NOT NULL,
+    "bagCostSum" DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY ("sourceAirportCode", "destinyAirportCode")
+);
+LOCK TABLE route IN SHARE MODE;
+DELETE FROM route_stats;
+INSERT INTO route_stats ("sourceAirportCode", "destinyAirportCode", count, "bagCostSum")
+SELECT "sourceAirportCode", "destinyAirportCode", COUNT(*), COALESCE(SUM("bagCost"), 0)
+FROM route
+GROUP BY "sourceAirportCode", "destinyAirportCode";
+COMMIT;
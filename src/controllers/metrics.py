@@ -0,0 +1,47 @@
+from flask import Blueprint, Response
+from ..services.route_service import read_flight, route_cache, route_writer
+from ..services.user_service import auth_flight, token_cache
+from ..web.timing import phase_metrics
+
+metrics_blueprint = Blueprint('metrics', __name__)
+
+@metrics_blueprint.route('/routes/metrics', methods=['GET'])
+def metrics():
+    body = (phase_metrics.render()
+            + render_cache_metrics({"route": route_cache, "token": token_cache})
+            + render_single_flight_metrics({"auth": auth_flight, "read": read_flight})
+            + render_group_commit_metrics(route_writer))
+    return Response(body, mimetype='text/plain; version=0.0.4'), 200
+
+def render_cache_metrics(caches):
+    lines = []
+    for metric, kind, key, help_text in (
+            ('routes_cache_hits_total', 'counter', 'hits', 'Lecturas resueltas desde la caché.'),
+            ('routes_cache_misses_total', 'counter', 'misses', 'Lecturas que no estaban en la caché.'),
+            ('routes_cache_hit_ratio', 'gauge', 'hitRate', 'Proporción de lecturas resueltas desde la caché.')):
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        for name, cache in caches.items():
+            lines.append(f'{metric}{{cache="{name}"}} {cache.stats()[key]}')
+    return '\n'.join(lines) + '\n'
+
+
+def render_single_flight_metrics(flights):
+    lines = [
+        '# HELP routes_single_flight_shared_total Llamadas que reutilizaron el resultado de otra llamada en curso.',
+        '# TYPE routes_single_flight_shared_total counter'
+    ]
+    for name, flight in flights.items():
+        lines.append(f'routes_single_flight_shared_total{{flight="{name}"}} {flight.shared}')
+    return '\n'.join(lines) + '\n'
+
+
+def render_group_commit_metrics(writer):
+    return '\n'.join([
+        '# HELP routes_group_commit_batches_total Transacciones confirmadas por el escritor agrupado.',
+        '# TYPE routes_group_commit_batches_total counter',
+        f'routes_group_commit_batches_total {writer.batches}',
+        '# HELP routes_group_commit_items_total Trayectos confirmados por el escritor agrupado.',
+        '# TYPE routes_group_commit_items_total counter',
+        f'routes_group_commit_items_total {writer.items}'
+    ]) + '\n'
@@ -1,14 +1,32 @@
+import time
 from flask import Blueprint, jsonify
+from sqlalchemy import text
 from ..database.database import db
 from ..models.route import Route
+from ..models.route_stats import RouteStats
+from ..services.route_service import route_cache
+from ..services.user_service import token_cache
+from ..services.version_service import VersionService
+from ..web.timing import phase_metrics
 reset_blueprint = Blueprint('reset', __name__)
 
 @reset_blueprint.route('/routes/reset', methods=['POST'])
 def reset():
+    started_at = time.perf_counter()
     session = get_session()
-    session.query(Route).delete()
+    if session.get_bind().dialect.name == 'postgresql':
+        session.execute(text('TRUNCATE TABLE route, route_stats'))
+    else:
+        session.query(Route).delete()
+        session.query(RouteStats).delete()
+    VersionService().bump_version(session)
     session.commit()
-    return jsonify({"msg": "Todos los datos fueron eliminados"}), 200
+    for cache in (route_cache, token_cache):
+        cache.clear()
+        cache.reset_stats()
+    phase_metrics.clear()
+    duration_ms = (time.perf_counter() - started_at) * 1000
+    return jsonify({"msg": "Todos los datos fueron eliminados", "durationMs": round(duration_ms, 3)}), 200
 
 def get_session():
-    return db.get_session()
\ No newline at end of file
+    return db.get_session()
@@ -1,12 +1,24 @@
 import uuid
-from flask import Blueprint, jsonify, request
+import requests
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from ..database.database import db
+from ..web.compression import etag_matches
+from ..web.json_provider import dumps, loads
+from ..web.timing import timed
 
 
-from ..services.route_service import RouteService
-from ..services.user_service import UserService
+from ..services.circuit_breaker import CircuitOpenError
+from ..services.route_service import ROUTE_FILTERS, RouteService
+from ..services.token_service import AUTH_MODE, TokenService
+from ..services.user_service import USERS_UNAVAILABLE_ERRORS, UserService
 
 route_blueprint = Blueprint('route', __name__)
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+@route_blueprint.errorhandler(CircuitOpenError)
+@route_blueprint.errorhandler(requests.RequestException)
+def users_unavailable(error=None):
+    return jsonify({"error": "El servicio de usuarios no está disponible"}), 503
 
 @route_blueprint.route('/routes', methods=['POST'])
 def create():
@@ -24,6 +36,26 @@ def create():
     route_service = RouteService()
     return route_service.create_route(data)
 
+@route_blueprint.route('/routes/batch', methods=['POST'])
+def create_batch():
+    auth_header = request.headers.get('Authorization')
+
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return jsonify({'message': 'No hay token en la solicitud'}), 403
+
+    token = auth_header.split(' ')[1]
+    if not is_valid_uuid(token):
+        return jsonify({'message': 'El token no es válido o está vencido.'}), 401
+
+    route_service = RouteService()
+    try:
+        results = route_service.create_routes(read_batch_items())
+        return jsonify({"results": results}), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": "Ocurrió un error en el servidor"}), 500
+
 @route_blueprint.route('/routes', methods=['GET'])
 def get_routes():
     auth_header = request.headers.get('Authorization')
@@ -36,15 +68,53 @@ def get_routes():
         return jsonify({'message': 'El token no es válido o está vencido.'}), 401
 
     flight_id = request.args.get('flight')
+    limit = request.args.get('limit')
+    after = request.args.get('after')
+    filters = {field: request.args[field] for field in ROUTE_FILTERS if field in request.args}
     route_service = RouteService()
     try:
-        routes = route_service.get_routes(flight_id)
-        return jsonify(routes), 200
+        ndjson = wants_ndjson()
+        version = route_service.get_version()
+        etag = f'routes-{version}' + ('-ndjson' if ndjson else '')
+        if etag_matches(request.if_none_match, etag):
+            return not_modified(etag)
+        if ndjson:
+            routes = route_service.stream_routes(flight_id, filters)
+            response = Response(stream_with_context(ndjson_lines(routes)), mimetype=NDJSON_MIMETYPE)
+        elif limit is not None or after is not None:
+            routes, next_cursor = route_service.get_routes_page(flight_id, limit, after, filters)
+            response = jsonify({"routes": routes, "next": next_cursor})
+        else:
+            routes = route_service.get_routes(flight_id, filters, version)
+            response = jsonify(routes)
+        return with_etag(response, etag), 200
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": "Ocurrió un error en el servidor"}), 500
     
+@route_blueprint.route('/routes/stats', methods=['GET'])
+def get_stats():
+    try:
+        auth_header = request.headers.get('Authorization')
+
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return jsonify({'message': 'No hay token en la solicitud'}), 403
+
+        token = auth_header.split(' ')[1]
+        if not is_valid_uuid(token):
+            return jsonify({'message': 'El token no es válido o está vencido.'}), 401
+        route_service = RouteService()
+        version = route_service.get_version()
+        etag = f'stats-{version}'
+        if etag_matches(request.if_none_match, etag):
+            return not_modified(etag)
+        return with_etag(jsonify(route_service.get_stats()), etag), 200
+    except USERS_UNAVAILABLE_ERRORS:
+        return users_unavailable()
+    except Exception as e:
+        return jsonify({"error": "Ocurrió un error en el servidor"}), 500
+
 @route_blueprint.route('/routes/<string:id>', methods=['GET'])
 def get_route_by_id(id):
     try:
@@ -57,8 +127,13 @@ def get_route_by_id(id):
         if not is_valid_uuid(token):
             return jsonify({'message': 'El token no es válido o está vencido.'}), 401
         route_service = RouteService()
-        route = route_service.get_route_by_id(id)
-        return jsonify(route), 200
+        route, version = route_service.get_route_by_id(id)
+        etag = f'route-{id}-{version}'
+        if etag_matches(request.if_none_match, etag):
+            return not_modified(etag)
+        return with_etag(jsonify(route), etag), 200
+    except USERS_UNAVAILABLE_ERRORS:
+        return users_unavailable()
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
     except FileNotFoundError:
@@ -83,14 +158,50 @@ def delete_route(id):
             return jsonify({"msg": "el trayecto fue eliminado"}), 200
         else:
             return jsonify({"error": "El trayecto con ese id no existe"}), 404
+    except USERS_UNAVAILABLE_ERRORS:
+        return users_unavailable()
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": "Ocurrió un error en el servidor"}), 500
 
+def wants_ndjson():
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def ndjson_lines(routes):
+    for route in routes:
+        yield dumps(route) + b'\n'
+
+def with_etag(response, etag):
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    return response
+
+def not_modified(etag):
+    return with_etag(Response(status=304), etag)
+
+def read_batch_items():
+    if request.mimetype == NDJSON_MIMETYPE:
+        return [parse_ndjson_line(line) for line in request.get_data(as_text=True).splitlines() if line.strip()]
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        raise ValueError("El cuerpo de la solicitud debe ser una lista de trayectos")
+    return items
+
+def parse_ndjson_line(line):
+    try:
+        return loads(line)
+    except ValueError:
+        return None
+
 def is_valid_uuid(id):
     try:
-        user_service = UserService()
-        return user_service.get_user_me(id)
+        with timed('auth'):
+            if AUTH_MODE != 'remote':
+                verified = TokenService().verify(id)
+                if verified is not None or AUTH_MODE == 'local':
+                    return bool(verified)
+            user_service = UserService()
+            return user_service.get_user_me(id)
     except ValueError:
         return False
\ No newline at end of file
@@ -1,8 +1,18 @@
-from sqlalchemy import create_engine
+from itertools import count
+from flask import g, has_request_context, request
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy_utils import database_exists, create_database
+from .instrumentation import QueryInstrumentation
+import logging
+import math
 import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 user = os.environ.get('DB_USER')
@@ -10,25 +20,83 @@ password = os.environ.get('DB_PASSWORD')
 host = os.environ.get('DB_HOST')
 port = os.environ.get('DB_PORT')
 name = os.environ.get('DB_NAME')
+pool_size = int(os.environ.get('DB_POOL_SIZE', '5'))
+max_overflow = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+pool_recycle = int(os.environ.get('DB_POOL_RECYCLE', '1800'))
+pool_pre_ping = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+statement_timeout = os.environ.get('DB_STATEMENT_TIMEOUT_MS')
+instrumentation_enabled = os.environ.get('DB_INSTRUMENTATION', 'false').lower() == 'true'
+slow_query_ms = float(os.environ.get('DB_SLOW_QUERY_MS', '100'))
+max_queries_per_request = int(os.environ.get('DB_MAX_QUERIES_PER_REQUEST', '10'))
+replica_uris = [uri.strip() for uri in os.environ.get('DB_REPLICA_URIS', '').split(',') if uri.strip()]
+replica_cooldown = float(os.environ.get('DB_REPLICA_COOLDOWN', '30'))
+read_after_write_window = float(os.environ.get('DB_READ_AFTER_WRITE_WINDOW', '5'))
+READ_AFTER_WRITE_COOKIE = 'routes_last_write'
 
 class Database:
-    def build(self, db_uri):
-        self.engine = create_engine(db_uri)
-        self.Session = sessionmaker(bind=self.engine)
+    engine = None
+    Session = None
+    ReadSession = None
+
+    def __init__(self, instrumentation=None):
+        self.instrumentation = instrumentation
+        self.replicas = []
+        self.replica_down_until = []
+        self._next_replica = count()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.teardown_appcontext(self.remove_session)
+        app.after_request(self.remember_write)
+        if self.instrumentation is not None:
+            app.teardown_request(self.instrumentation.check_request)
+
+    def build(self, db_uri, read_uris=()):
+        self.engine = self.create_engine(db_uri)
+        self.replicas = [self.create_engine(uri) for uri in read_uris]
+        self.replica_down_until = [0.0] * len(self.replicas)
+        for index, replica in enumerate(self.replicas):
+            event.listen(replica, 'handle_error', lambda context, index=index: self.check_replica_error(index, context))
+        primary_factory = sessionmaker(bind=self.engine)
+        event.listen(primary_factory, 'after_commit', self.mark_write)
+        self.Session = scoped_session(primary_factory)
+        self.ReadSession = scoped_session(sessionmaker())
+
+    def create_engine(self, db_uri):
+        engine = create_engine(db_uri, **self.get_engine_options(db_uri))
+        if self.instrumentation is not None:
+            self.instrumentation.install(engine)
+        return engine
+
+    def get_engine_options(self, db_uri):
+        if db_uri.startswith('sqlite'):
+            return {}
+        options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping
+        }
+        if statement_timeout:
+            options["connect_args"] = {"options": f"-c statement_timeout={int(statement_timeout)}"}
+        return options
 
     def create_all(self):
         is_test = os.environ.get('is_test')
         uri = self.get_uri(is_test)
         self.create_database(is_test, uri)
-        self.build(uri)        
+        self.build(uri, self.get_replica_uris(is_test))
         Base.metadata.create_all(self.engine)
 
     def get_uri(self, is_test):
-        uri = f'postgresql://{user}:{password}@{host}:{port}/{name}'        
+        uri = os.environ.get('DB_URI') or f'postgresql://{user}:{password}@{host}:{port}/{name}'
         if is_test :
             uri = f'sqlite:///:memory:'
         return uri
 
+    def get_replica_uris(self, is_test):
+        return [] if is_test else replica_uris
+
     def create_database(self, is_test, uri):
         if not database_exists(uri) and not is_test:
             create_database(uri)
@@ -36,7 +104,82 @@ class Database:
     def drop_all(self):
         Base.metadata.drop_all(self.engine)
 
+    def init_engine(self):
+        with self._lock:
+            if self.Session is None:
+                is_test = os.environ.get('is_test')
+                self.build(self.get_uri(is_test), self.get_replica_uris(is_test))
+
     def get_session(self):
+        if self.Session is None:
+            self.init_engine()
         return self.Session()
 
-db = Database()
+    def get_read_session(self):
+        if self.Session is None:
+            self.init_engine()
+        if self.ReadSession.registry.has():
+            return self.ReadSession()
+        replica = self.pick_replica()
+        if replica is None:
+            return self.Session()
+        return self.ReadSession(bind=replica)
+
+    def pick_replica(self):
+        if not self.replicas or self.Session.registry.has() or self.wrote_recently():
+            return None
+        now = time.monotonic()
+        start = next(self._next_replica)
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self.replica_down_until[index] <= now:
+                return self.replicas[index]
+        return None
+
+    def read(self, fn):
+        session = self.get_read_session()
+        try:
+            return fn(session)
+        except OperationalError:
+            if session.bind is self.engine:
+                raise
+            logger.warning("Falló la lectura en una réplica; se reintenta en el primario")
+            self.ReadSession.remove()
+            return fn(self.get_session())
+
+    def wrote_recently(self):
+        if not has_request_context():
+            return False
+        try:
+            last_write = float(request.cookies.get(READ_AFTER_WRITE_COOKIE, ''))
+        except ValueError:
+            return False
+        return time.time() - last_write < read_after_write_window
+
+    def mark_write(self, session=None):
+        if has_request_context():
+            g.db_wrote = True
+
+    def remember_write(self, response):
+        if self.replicas and g.get('db_wrote'):
+            response.set_cookie(READ_AFTER_WRITE_COOKIE, repr(time.time()), max_age=math.ceil(read_after_write_window), httponly=True)
+        return response
+
+    def check_replica_error(self, index, context):
+        if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+            logger.warning("Réplica de lectura %d no disponible durante %ss: %s", index, replica_cooldown, context.original_exception)
+            self.replica_down_until[index] = time.monotonic() + replica_cooldown
+
+    def remove_session(self, exception=None):
+        if self.Session is not None:
+            self.Session.remove()
+        if self.ReadSession is not None:
+            self.ReadSession.remove()
+
+    def dispose_after_fork(self):
+        for engine in [self.engine] + self.replicas:
+            if engine is not None:
+                engine.dispose(close=False)
+
+db = Database(QueryInstrumentation(slow_query_ms, max_queries_per_request) if instrumentation_enabled else None)
+os.register_at_fork(after_in_child=db.dispose_after_fork)
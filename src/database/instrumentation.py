@@ -0,0 +1,44 @@
+import logging
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+
+class QueryInstrumentation:
+
+    def __init__(self, slow_query_ms=100, max_queries_per_request=10):
+        self.slow_query_ms = slow_query_ms
+        self.max_queries_per_request = max_queries_per_request
+
+    def install(self, engine):
+        event.listen(engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('instrumentation_started_at', []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('instrumentation_started_at')
+        if not started:
+            return
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+        if has_request_context():
+            g.query_count = g.get('query_count', 0) + 1
+        if elapsed_ms >= self.slow_query_ms:
+            logger.warning("Consulta lenta (%.1f ms) en %s: %s parámetros=%r",
+                           elapsed_ms, current_endpoint(), statement, parameters)
+
+    def check_request(self, exception=None):
+        count = g.get('query_count', 0)
+        if count > self.max_queries_per_request:
+            logger.warning("La solicitud %s ejecutó %d consultas (máximo %d): posible patrón N+1",
+                           current_endpoint(), count, self.max_queries_per_request)
+        return count
+
+def current_endpoint():
+    if not has_request_context():
+        return 'fuera de una solicitud'
+    rule = request.url_rule.rule if request.url_rule else request.path
+    return f'{request.method} {rule}'
@@ -1,22 +1,30 @@
 from ..database import database
-from sqlalchemy import Column, String, DateTime, Float
+from sqlalchemy import Column, String, DateTime, Float, Index
+from .types import GUID
 
 
 class Route(database.Base):
 
     __tablename__ = 'route'
+    __table_args__ = (
+        Index('ix_route_source_airport_start', 'sourceAirportCode', 'plannedStartDate'),
+        Index('ix_route_destiny_airport_start', 'destinyAirportCode', 'plannedStartDate'),
+        Index('ix_route_source_country_start', 'sourceCountry', 'plannedStartDate'),
+        Index('ix_route_destiny_country_start', 'destinyCountry', 'plannedStartDate'),
+        Index('ix_route_planned_start', 'plannedStartDate'),
+    )
 
-    id = Column(String, primary_key=True)
-    flightId = Column(String)
+    id = Column(GUID, primary_key=True)
+    flightId = Column(String, unique=True, index=True)
     sourceAirportCode = Column(String)
     sourceCountry = Column(String)
     destinyAirportCode = Column(String)
     destinyCountry = Column(String)
     bagCost = Column(Float)
-    plannedStartDate = Column(DateTime)
-    plannedEndDate = Column(DateTime)
-    createdAt = Column(DateTime)
-    updateAt = Column(DateTime)
+    plannedStartDate = Column(DateTime(timezone=True))
+    plannedEndDate = Column(DateTime(timezone=True))
+    createdAt = Column(DateTime(timezone=True))
+    updateAt = Column(DateTime(timezone=True))
 
     def __init__(self, id, flightId, sourceAirportCode, sourceCountry, destinyAirportCode, destinyCountry, bagCost, plannedStartDate, plannedEndDate, createdAt, updateAt):
         self.id = id
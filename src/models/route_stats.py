@@ -0,0 +1,18 @@
+from ..database import database
+from sqlalchemy import Column, String, BigInteger, Float
+
+
+class RouteStats(database.Base):
+
+    __tablename__ = 'route_stats'
+
+    sourceAirportCode = Column(String, primary_key=True)
+    destinyAirportCode = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False)
+    bagCostSum = Column(Float, nullable=False)
+
+    def __init__(self, sourceAirportCode, destinyAirportCode, count, bagCostSum):
+        self.sourceAirportCode = sourceAirportCode
+        self.destinyAirportCode = destinyAirportCode
+        self.count = count
+        self.bagCostSum = bagCostSum
@@ -0,0 +1,14 @@
+from ..database import database
+from sqlalchemy import Column, Integer, BigInteger
+
+
+class RouteVersion(database.Base):
+
+    __tablename__ = 'route_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+
+    def __init__(self, id, version):
+        self.id = id
+        self.version = version
@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from ..web.json_provider import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if self.max_size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": self.hits / lookups if lookups else 0.0
+            }
+
+
+class RedisCache:
+
+    def __init__(self, url, prefix='route', ttl=60):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.errors = redis.RedisError
+        self.prefix = prefix
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        try:
+            value = self.client.get(self.make_key(key))
+        except self.errors as e:
+            logger.warning("Redis no disponible al leer %s: %s", key, e)
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return loads(value)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        try:
+            self.client.set(self.make_key(key), dumps(value), px=int(ttl * 1000))
+        except self.errors as e:
+            logger.warning("Redis no disponible al guardar %s: %s", key, e)
+
+    def delete(self, key):
+        try:
+            self.client.delete(self.make_key(key))
+        except self.errors as e:
+            logger.warning("Redis no disponible al borrar %s: %s", key, e)
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=f'{self.prefix}:*'))
+            if keys:
+                self.client.delete(*keys)
+        except self.errors as e:
+            logger.warning("Redis no disponible al vaciar la caché %s: %s", self.prefix, e)
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0
+            }
+
+    def make_key(self, key):
+        return f'{self.prefix}:{key}'
+
+
+def build_cache(backend, max_size, ttl, url=None, prefix='route'):
+    if backend == 'redis':
+        return RedisCache(url, prefix, ttl)
+    if backend == 'memory':
+        return LRUCache(max_size, ttl)
+    raise ValueError(f"Backend de caché desconocido: {backend}")
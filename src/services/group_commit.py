@@ -0,0 +1,79 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from sqlalchemy.exc import OperationalError, StatementError
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+
+    def __init__(self, flush, max_batch=100, max_delay=0.005):
+        self.flush = flush
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.items = 0
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, item):
+        future = Future()
+        self.ensure_started().put((item, future))
+        return future
+
+    def ensure_started(self):
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self.run, args=(self._queue,), name='group-commit-writer', daemon=True)
+                self._thread.start()
+            return self._queue
+
+    def run(self, pending):
+        while True:
+            batch = [pending.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.write(batch)
+
+    def write(self, batch):
+        try:
+            results = self.flush([item for item, _ in batch])
+        except OperationalError as e:
+            self.fail(batch, e)
+            return
+        except StatementError as e:
+            if len(batch) == 1:
+                self.fail(batch, e)
+                return
+            logger.warning("Falló la confirmación agrupada de %d trayectos; se reintentan uno a uno", len(batch))
+            for item in batch:
+                self.write([item])
+            return
+        except Exception as e:
+            self.fail(batch, e)
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def fail(self, batch, error):
+        logger.error("Falló la confirmación agrupada de %d trayectos: %s", len(batch), error)
+        for _, future in batch:
+            future.set_exception(error)
@@ -1,93 +1,276 @@
 import re
 import uuid
 from flask import jsonify
+from sqlalchemy import delete, select
+from sqlalchemy.exc import OperationalError, StatementError
 from ..database.database import db
 from ..models.route import Route
+from .cache import build_cache
+from .group_commit import GroupCommitWriter
+from .single_flight import SingleFlight
+from .stats_service import UPSERT_INSERTS, StatsService
+from .version_service import VersionService
 from datetime import datetime, timezone
 from dateutil.parser import isoparse
+import os
+
+DEFAULT_PAGE_SIZE = int(os.environ.get('ROUTES_DEFAULT_PAGE_SIZE', '100'))
+MAX_PAGE_SIZE = int(os.environ.get('ROUTES_MAX_PAGE_SIZE', '1000'))
+STREAM_BATCH_SIZE = int(os.environ.get('ROUTES_STREAM_BATCH_SIZE', '1000'))
+BATCH_CHUNK_SIZE = int(os.environ.get('ROUTES_BATCH_CHUNK_SIZE', '500'))
+BATCH_MAX_ITEMS = int(os.environ.get('ROUTES_BATCH_MAX_ITEMS', '10000'))
+TEXT_FIELDS = ["flightId", "sourceAirportCode", "sourceCountry", "destinyAirportCode", "destinyCountry"]
+REQUIRED_FIELDS = ["flightId", "sourceAirportCode", "sourceCountry", "destinyAirportCode", "destinyCountry", "bagCost", "plannedStartDate", "plannedEndDate"]
+WRITE_MODE = os.environ.get('ROUTES_WRITE_MODE', 'direct')
+GROUP_COMMIT_MAX_BATCH = int(os.environ.get('ROUTES_GROUP_COMMIT_MAX_BATCH', '100'))
+GROUP_COMMIT_MAX_DELAY_MS = float(os.environ.get('ROUTES_GROUP_COMMIT_MAX_DELAY_MS', '5'))
+
+EQUALITY_FILTERS = ("sourceAirportCode", "destinyAirportCode", "sourceCountry", "destinyCountry")
+ROUTE_FILTERS = EQUALITY_FILTERS + ("plannedStartDateFrom", "plannedStartDateTo")
+
+route_table = Route.__table__
+read_flight = SingleFlight()
+ROUTE_COLUMNS = [route_table.c[field] for field in ("id", "flightId", "sourceAirportCode", "sourceCountry", "destinyAirportCode", "destinyCountry", "bagCost", "plannedStartDate", "plannedEndDate", "createdAt")]
+
+route_cache = build_cache(
+    os.environ.get('ROUTE_CACHE_BACKEND', 'memory'),
+    int(os.environ.get('ROUTE_CACHE_MAX_SIZE', '10000')),
+    float(os.environ.get('ROUTE_CACHE_TTL', '30')),
+    os.environ.get('ROUTE_CACHE_URL', 'redis://localhost:6379/0')
+)
 
 class RouteService:
 
     def create_route(self, data):
         try:
-            required_fields = ["flightId", "sourceAirportCode", "sourceCountry", "destinyAirportCode", "destinyCountry", "bagCost", "plannedStartDate", "plannedEndDate"]
-            for field in required_fields:
-                if field not in data:
-                    return jsonify({"error": f"El campo '{field}' es obligatorio"}), 400
-
-            flight_id = data["flightId"]
-            source_airport_code = data["sourceAirportCode"]
-            source_country = data["sourceCountry"]
-            destiny_airport_code = data["destinyAirportCode"]
-            destiny_country = data["destinyCountry"]
-            bag_cost = data["bagCost"]
-            planned_start_date = isoparse(data["plannedStartDate"]).replace(tzinfo=timezone.utc)
-            
-            planned_end_date = isoparse(data["plannedEndDate"]).replace(tzinfo=timezone.utc)
-
-            if planned_start_date >= planned_end_date or planned_start_date < datetime.now(timezone.utc):
-                return jsonify({"msg": "Las fechas del trayecto no son válidas"}), 412
+            values, error = self.validate_route_data(data)
+            if error:
+                return jsonify(error[0]), error[1]
 
-            session = db.get_session()
-            _route = session.query(Route).filter(Route.flightId == flight_id).first()
+            created_at = datetime.now(timezone.utc)
+            if WRITE_MODE == 'group':
+                return self.create_route_grouped(values, created_at)
 
-            if _route:
+            row = dict(values, id=str(uuid.uuid4()), createdAt=created_at, updateAt=created_at)
+            if not self.commit_routes([row])[0]:
                 return jsonify({"msg": "El flightId ya existe"}), 412
-
-            created_at = datetime.now()
-
-            new_route = Route(
-                str(uuid.uuid4()),
-                flight_id,
-                source_airport_code,
-                source_country,
-                destiny_airport_code,
-                destiny_country,
-                bag_cost,
-                planned_start_date,
-                planned_end_date,
-                created_at,
-                created_at
-            )
-
-            session.add(new_route)
-            session.commit()
-            return jsonify({"id": new_route.id, "createdAt": created_at.isoformat()}), 201
+            route_cache.delete(row["id"])
+            return jsonify({"id": row["id"], "createdAt": created_at.isoformat()}), 201
 
         except Exception as e:
             return jsonify({"error": "Ocurrió un error en el servidor"}), 500
 
-    def get_routes(self, flight_id=None):
+    def create_route_grouped(self, values, created_at):
+        row = dict(values, id=str(uuid.uuid4()), createdAt=created_at, updateAt=created_at)
+        if not route_writer.submit(row).result():
+            return jsonify({"msg": "El flightId ya existe"}), 412
+        db.mark_write()
+        route_cache.delete(row["id"])
+        return jsonify({"id": row["id"], "createdAt": created_at.isoformat()}), 201
+
+    def validate_route_data(self, data):
+        for field in REQUIRED_FIELDS:
+            if field not in data:
+                return None, ({"error": f"El campo '{field}' es obligatorio"}, 400)
+        for field in TEXT_FIELDS:
+            if not isinstance(data[field], str):
+                return None, ({"error": f"El campo '{field}' debe ser un texto"}, 400)
+        if isinstance(data["bagCost"], bool) or not isinstance(data["bagCost"], (int, float)):
+            return None, ({"error": "El campo 'bagCost' debe ser numérico"}, 400)
+
+        planned_start_date = isoparse(data["plannedStartDate"]).replace(tzinfo=timezone.utc)
+        planned_end_date = isoparse(data["plannedEndDate"]).replace(tzinfo=timezone.utc)
+
+        if planned_start_date >= planned_end_date or planned_start_date < datetime.now(timezone.utc):
+            return None, ({"msg": "Las fechas del trayecto no son válidas"}, 412)
+
+        return {
+            "flightId": data["flightId"],
+            "sourceAirportCode": data["sourceAirportCode"],
+            "sourceCountry": data["sourceCountry"],
+            "destinyAirportCode": data["destinyAirportCode"],
+            "destinyCountry": data["destinyCountry"],
+            "bagCost": data["bagCost"],
+            "plannedStartDate": planned_start_date,
+            "plannedEndDate": planned_end_date
+        }, None
+
+    def create_routes(self, items):
+        if len(items) > BATCH_MAX_ITEMS:
+            raise ValueError(f"El lote no puede tener más de {BATCH_MAX_ITEMS} trayectos")
+
+        results = []
+        seen_flight_ids = set()
+        for start in range(0, len(items), BATCH_CHUNK_SIZE):
+            pending = []
+            for index, data in enumerate(items[start:start + BATCH_CHUNK_SIZE], start):
+                result, row = self.prepare_batch_item(index, data, seen_flight_ids)
+                results.append(result)
+                if row:
+                    pending.append((result, row))
+            if pending:
+                self.insert_batch(pending)
+        return results
+
+    def prepare_batch_item(self, index, data, seen_flight_ids):
+        if not isinstance(data, dict):
+            return {"index": index, "status": 400, "error": "El trayecto no es un objeto JSON válido"}, None
+        try:
+            values, error = self.validate_route_data(data)
+            if error:
+                return dict(error[0], index=index, status=error[1]), None
+            if values["flightId"] in seen_flight_ids:
+                return {"index": index, "status": 412, "msg": "El flightId ya existe"}, None
+            seen_flight_ids.add(values["flightId"])
+        except (TypeError, ValueError, OverflowError):
+            return {"index": index, "status": 400, "error": "El trayecto no tiene un formato válido"}, None
+
+        created_at = datetime.now(timezone.utc)
+        row = dict(values, id=str(uuid.uuid4()), createdAt=created_at, updateAt=created_at)
+        return {"index": index, "status": 201, "id": row["id"], "createdAt": created_at.isoformat()}, row
+
+    def insert_batch(self, pending):
+        rows = [row for _, row in pending]
+        try:
+            created = self.commit_routes(rows)
+        except OperationalError as e:
+            raise e
+        except StatementError:
+            created = [self.commit_route_alone(row) for row in rows]
+
+        for (result, row), inserted in zip(pending, created):
+            if inserted is None:
+                index = result["index"]
+                result.clear()
+                result.update({"index": index, "status": 400, "error": "El trayecto no tiene un formato válido"})
+            elif not inserted:
+                index = result["index"]
+                result.clear()
+                result.update({"index": index, "status": 412, "msg": "El flightId ya existe"})
+
+    def commit_route_alone(self, row):
+        try:
+            return self.commit_routes([row])[0]
+        except OperationalError as e:
+            raise e
+        except StatementError:
+            return None
+
+    def commit_routes(self, rows):
+        session = db.get_session()
+        try:
+            inserted = set(self.insert_routes(session, rows))
+            if inserted:
+                VersionService().bump_version(session)
+                StatsService().add_routes(session, [row for row in rows if row["id"] in inserted])
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        return [row["id"] in inserted for row in rows]
+
+    def insert_routes(self, session, rows):
+        insert = UPSERT_INSERTS[session.get_bind().dialect.name]
+        statement = insert(route_table).on_conflict_do_nothing(index_elements=[Route.flightId]).returning(Route.id)
+        return session.scalars(statement, rows).all()
+
+    def get_version(self):
+        return db.read(VersionService().get_version)
+
+    def get_stats(self):
+        return db.read(StatsService().get_stats)
+
+    def get_routes(self, flight_id=None, filters=None, version=None):
             try:
-                if flight_id and not self.is_valid_flight_id(flight_id):
-                    raise ValueError("El formato del flightId no es válido")
-                
-                session = db.get_session()
-                if flight_id:
-                    routes = session.query(Route).filter(Route.flightId == flight_id).all()
-                else:
-                    routes = session.query(Route).all()
-
-                route_list = []
-                for route in routes:
-                    route_data = {
-                        "id": route.id,
-                        "flightId": route.flightId,
-                        "sourceAirportCode": route.sourceAirportCode,
-                        "sourceCountry": route.sourceCountry,
-                        "destinyAirportCode": route.destinyAirportCode,
-                        "destinyCountry": route.destinyCountry,
-                        "bagCost": route.bagCost,
-                        "plannedStartDate": route.plannedStartDate,
-                        "plannedEndDate": route.plannedEndDate,
-                        "createdAt": route.createdAt.isoformat()
-                    }
-                    route_list.append(route_data)
-
-                return route_list
+                statement = self.select_routes(flight_id, filters)
+                key = ('routes', version, flight_id, tuple(sorted((filters or {}).items())))
+                return read_flight.do(key, lambda: db.read(lambda session: self.to_route_list(session.execute(statement))))
 
             except Exception as e:
                 raise e
+
+    def get_routes_page(self, flight_id=None, limit=None, after=None, filters=None):
+        statement = self.select_routes(flight_id, filters)
+        limit = self.parse_limit(limit)
+        if after and not self.is_valid_uuid(after):
+            raise ValueError("El cursor after no es un valor string con formato uuid")
+
+        if after:
+            statement = statement.where(route_table.c.id > after)
+        statement = statement.order_by(route_table.c.id).limit(limit + 1)
+        rows = db.read(lambda session: session.execute(statement).all())
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1].id
+        return self.to_route_list(rows), next_cursor
+
+    def stream_routes(self, flight_id=None, filters=None):
+        statement = self.select_routes(flight_id, filters)
+        return self.iter_routes(statement.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+    def iter_routes(self, statement):
+        session, rows = db.read(lambda session: (session, session.execute(statement)))
+        try:
+            for row in rows:
+                yield self.to_route_dict(row)
+        finally:
+            session.close()
+
+    def select_routes(self, flight_id=None, filters=None):
+        if flight_id and not self.is_valid_flight_id(flight_id):
+            raise ValueError("El formato del flightId no es válido")
+
+        statement = select(*ROUTE_COLUMNS)
+        if flight_id:
+            statement = statement.where(route_table.c.flightId == flight_id)
+        for field, value in (filters or {}).items():
+            if field in EQUALITY_FILTERS:
+                statement = statement.where(route_table.c[field] == value)
+            elif field == "plannedStartDateFrom":
+                statement = statement.where(route_table.c.plannedStartDate >= self.parse_filter_date(field, value))
+            elif field == "plannedStartDateTo":
+                statement = statement.where(route_table.c.plannedStartDate < self.parse_filter_date(field, value))
+            else:
+                raise ValueError(f"El filtro '{field}' no es válido")
+        return statement
+
+    def parse_filter_date(self, field, value):
+        try:
+            return isoparse(value).replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"El parámetro {field} no tiene un formato de fecha válido")
+
+    def parse_limit(self, limit):
+        if limit is None:
+            return DEFAULT_PAGE_SIZE
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("El parámetro limit debe ser un número entero")
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            raise ValueError(f"El parámetro limit debe estar entre 1 y {MAX_PAGE_SIZE}")
+        return limit
+
+    def to_route_list(self, rows):
+        to_route_dict = self.to_route_dict
+        return [to_route_dict(row) for row in rows]
+
+    def to_route_dict(self, row):
+        id, flight_id, source_airport_code, source_country, destiny_airport_code, destiny_country, bag_cost, planned_start_date, planned_end_date, created_at = row
+        return {
+            "id": id,
+            "flightId": flight_id,
+            "sourceAirportCode": source_airport_code,
+            "sourceCountry": source_country,
+            "destinyAirportCode": destiny_airport_code,
+            "destinyCountry": destiny_country,
+            "bagCost": bag_cost,
+            "plannedStartDate": planned_start_date,
+            "plannedEndDate": planned_end_date,
+            "createdAt": created_at
+        }
         
     def is_valid_flight_id(self, flight_id):
         if isinstance(flight_id, str):
@@ -104,29 +287,25 @@ class RouteService:
             if not self.is_valid_uuid(id):
                 raise ValueError("El id no es un valor string con formato uuid")
 
-            session = db.get_session()
-            route = session.query(Route).filter(Route.id == id).first()
+            cached = route_cache.get(id)
+            if cached is not None:
+                return cached["route"], cached["version"]
 
-            if not route:
-                raise FileNotFoundError
-
-            route_data = {
-                    "id": route.id,
-                    "flightId": route.flightId,
-                    "sourceAirportCode": route.sourceAirportCode,
-                    "sourceCountry": route.sourceCountry,
-                    "destinyAirportCode": route.destinyAirportCode,
-                    "destinyCountry": route.destinyCountry,
-                    "bagCost": route.bagCost,
-                    "plannedStartDate": route.plannedStartDate.isoformat(),
-                    "plannedEndDate": route.plannedEndDate.isoformat(),
-                    "createdAt": route.createdAt.isoformat()
-            }
-
-            return route_data
+            return read_flight.do(('route', id), lambda: self.load_route(id))
 
         except Exception as e:
             raise e
+
+    def load_route(self, id):
+        statement = select(*ROUTE_COLUMNS).where(route_table.c.id == id)
+        version, row = db.read(lambda session: (VersionService().get_version(session), session.execute(statement).first()))
+
+        if not row:
+            raise FileNotFoundError
+
+        route_data = self.to_route_dict(row)
+        route_cache.set(id, {"version": version, "route": route_data})
+        return route_data, version
     
     def is_valid_uuid(self, id):
         try:
@@ -141,14 +320,27 @@ class RouteService:
                 raise ValueError("El id no es un valor string con formato uuid")
 
             session = db.get_session()
-            route = session.query(Route).filter(Route.id == id).first()
+            route = session.execute(
+                delete(route_table)
+                .where(route_table.c.id == id)
+                .returning(route_table.c.sourceAirportCode, route_table.c.destinyAirportCode, route_table.c.bagCost)
+            ).first()
 
             if not route:
+                session.rollback()
                 return False
 
-            session.delete(route)
+            VersionService().bump_version(session)
+            StatsService().remove_route(session, route)
             session.commit()
+            route_cache.delete(id)
             return True
 
         except Exception as e:
-            raise e
\ No newline at end of file
+            raise e
+
+route_writer = GroupCommitWriter(
+    lambda rows: RouteService().commit_routes(rows),
+    GROUP_COMMIT_MAX_BATCH,
+    GROUP_COMMIT_MAX_DELAY_MS / 1000
+)
@@ -0,0 +1,53 @@
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from ..models.route_stats import RouteStats
+
+UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+stats_table = RouteStats.__table__
+
+class StatsService:
+
+    def add_routes(self, session, rows):
+        pairs = {}
+        for row in rows:
+            key = (row["sourceAirportCode"], row["destinyAirportCode"])
+            count, bag_cost_sum = pairs.get(key, (0, 0.0))
+            pairs[key] = (count + 1, bag_cost_sum + float(row["bagCost"]))
+        if not pairs:
+            return
+
+        insert = UPSERT_INSERTS[session.get_bind().dialect.name]
+        statement = insert(stats_table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[stats_table.c.sourceAirportCode, stats_table.c.destinyAirportCode],
+            set_={
+                "count": stats_table.c["count"] + statement.excluded["count"],
+                "bagCostSum": stats_table.c.bagCostSum + statement.excluded.bagCostSum
+            }
+        )
+        session.execute(statement, [
+            {"sourceAirportCode": source, "destinyAirportCode": destiny, "count": count, "bagCostSum": bag_cost_sum}
+            for (source, destiny), (count, bag_cost_sum) in pairs.items()
+        ])
+
+    def remove_route(self, session, route):
+        pair = (stats_table.c.sourceAirportCode == route.sourceAirportCode) & (stats_table.c.destinyAirportCode == route.destinyAirportCode)
+        session.execute(
+            update(stats_table)
+            .where(pair)
+            .values(count=stats_table.c["count"] - 1, bagCostSum=stats_table.c.bagCostSum - float(route.bagCost or 0))
+        )
+        session.execute(delete(stats_table).where(pair & (stats_table.c["count"] <= 0)))
+
+    def get_stats(self, session):
+        rows = session.execute(
+            select(stats_table.c.sourceAirportCode, stats_table.c.destinyAirportCode, stats_table.c["count"], stats_table.c.bagCostSum)
+            .order_by(stats_table.c.sourceAirportCode, stats_table.c.destinyAirportCode)
+        )
+        return [{
+            "sourceAirportCode": source,
+            "destinyAirportCode": destiny,
+            "count": count,
+            "averageBagCost": bag_cost_sum / count
+        } for source, destiny, count, bag_cost_sum in rows]
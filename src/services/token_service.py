@@ -0,0 +1,114 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+AUTH_MODE = os.getenv('AUTH_MODE', 'remote')
+AUTH_TOKEN_KEYS = os.getenv('AUTH_TOKEN_KEYS', '')
+AUTH_TOKEN_KEY_FILE = os.getenv('AUTH_TOKEN_KEY_FILE')
+AUTH_TOKEN_KEY_REFRESH = float(os.getenv('AUTH_TOKEN_KEY_REFRESH', '60'))
+AUTH_TOKEN_LEEWAY = float(os.getenv('AUTH_TOKEN_LEEWAY', '30'))
+DEFAULT_KID = 'default'
+ALGORITHMS = {'HS256': hashlib.sha256, 'HS384': hashlib.sha384, 'HS512': hashlib.sha512}
+
+def b64decode(segment):
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+def b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+def parse_keys(value):
+    keys = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        kid, separator, secret = item.partition(':')
+        if separator:
+            keys[kid] = secret.encode('utf-8')
+        else:
+            keys[DEFAULT_KID] = kid.encode('utf-8')
+    return keys
+
+def sign_token(claims, secret, kid=None, algorithm='HS256'):
+    header = {"alg": algorithm, "typ": "JWT"}
+    if kid:
+        header["kid"] = kid
+    signing_input = f'{b64encode(json.dumps(header).encode())}.{b64encode(json.dumps(claims).encode())}'
+    signature = hmac.new(secret, signing_input.encode('ascii'), ALGORITHMS[algorithm]).digest()
+    return f'{signing_input}.{b64encode(signature)}'
+
+
+class KeyRing:
+
+    def __init__(self, keys='', key_file=None, refresh=60):
+        self.env_keys = parse_keys(keys)
+        self.key_file = key_file
+        self.refresh = refresh
+        self.file_keys = {}
+        self.file_mtime = None
+        self.checked_at = None
+        self._lock = threading.Lock()
+
+    def get(self, kid):
+        if self.key_file:
+            self.reload_if_changed()
+        return self.file_keys.get(kid) or self.env_keys.get(kid)
+
+    def reload_if_changed(self):
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < self.refresh:
+            return
+        with self._lock:
+            self.checked_at = now
+            try:
+                mtime = os.path.getmtime(self.key_file)
+            except OSError:
+                return
+            if mtime == self.file_mtime:
+                return
+            with open(self.key_file) as file:
+                self.file_keys = {kid: secret.encode('utf-8') for kid, secret in json.load(file).items()}
+            self.file_mtime = mtime
+
+key_ring = KeyRing(AUTH_TOKEN_KEYS, AUTH_TOKEN_KEY_FILE, AUTH_TOKEN_KEY_REFRESH)
+
+class TokenService:
+
+    def verify(self, token):
+        parts = token.split('.')
+        if len(parts) != 3:
+            return None
+        try:
+            header = json.loads(b64decode(parts[0]))
+            claims = json.loads(b64decode(parts[1]))
+            signature = b64decode(parts[2])
+        except (ValueError, TypeError):
+            return None
+        if not isinstance(header, dict) or not isinstance(claims, dict):
+            return None
+
+        algorithm = header.get("alg")
+        kid = header.get("kid", DEFAULT_KID)
+        if not isinstance(algorithm, str) or not isinstance(kid, str):
+            return None
+
+        digest = ALGORITHMS.get(algorithm)
+        secret = key_ring.get(kid)
+        if digest is None or secret is None:
+            return None
+
+        expected = hmac.new(secret, f'{parts[0]}.{parts[1]}'.encode('ascii'), digest).digest()
+        if not hmac.compare_digest(expected, signature):
+            return False
+        now = time.time()
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or expires_at + AUTH_TOKEN_LEEWAY < now:
+            return False
+        not_before = claims.get("nbf")
+        if isinstance(not_before, (int, float)) and not_before - AUTH_TOKEN_LEEWAY > now:
+            return False
+        return True
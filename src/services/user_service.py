@@ -1,18 +1,65 @@
 import requests
 import os
+import threading
 
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from .cache import LRUCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .single_flight import SingleFlight
+
+load_dotenv()
+TOKEN_CACHE_TTL = float(os.getenv('USERS_TOKEN_CACHE_TTL', '60'))
+TOKEN_CACHE_NEGATIVE_TTL = float(os.getenv('USERS_TOKEN_CACHE_NEGATIVE_TTL', '5'))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv('USERS_TOKEN_CACHE_MAX_SIZE', '10000'))
+POOL_CONNECTIONS = int(os.getenv('USERS_POOL_CONNECTIONS', '10'))
+POOL_MAXSIZE = int(os.getenv('USERS_POOL_MAXSIZE', '10'))
+CONNECT_TIMEOUT = float(os.getenv('USERS_CONNECT_TIMEOUT', '1'))
+READ_TIMEOUT = float(os.getenv('USERS_READ_TIMEOUT', '3'))
+BREAKER_THRESHOLD = int(os.getenv('USERS_BREAKER_THRESHOLD', '5'))
+BREAKER_RESET_TIMEOUT = float(os.getenv('USERS_BREAKER_RESET_TIMEOUT', '30'))
+
+users_adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+local_sessions = threading.local()
+
+def get_users_session():
+    session = getattr(local_sessions, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.mount('http://', users_adapter)
+        session.mount('https://', users_adapter)
+        local_sessions.session = session
+    return session
+
+token_cache = LRUCache(TOKEN_CACHE_MAX_SIZE, TOKEN_CACHE_TTL)
+auth_flight = SingleFlight()
+users_breaker = CircuitBreaker('users', BREAKER_THRESHOLD, BREAKER_RESET_TIMEOUT)
+USERS_UNAVAILABLE_ERRORS = (CircuitOpenError, requests.RequestException)
 
 class UserService:
     load_dotenv()
     HOST = os.getenv('USERS_PATH')
 
     def get_user_me(self, token) :
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached
+        return auth_flight.do(token, lambda: self.fetch_user_me(token))
+
+    def fetch_user_me(self, token):
+        users_breaker.before_call()
         try:
-            response = requests.get(f'{self.HOST}/users/me', headers={'Authorization': f'Bearer {token}', 'Content-type': 'application/json', 'Accept': 'application/json'})
-            if response.status_code == 200:
-                return True
-            else :
-                return False
+            response = get_users_session().get(f'{self.HOST}/users/me', headers={'Authorization': f'Bearer {token}', 'Content-type': 'application/json', 'Accept': 'application/json'}, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
         except Exception as e:
-                    raise e
\ No newline at end of file
+            users_breaker.record_failure()
+            raise e
+        if response.status_code >= 500:
+            users_breaker.record_failure()
+            raise requests.HTTPError(f"El servicio de usuarios respondió {response.status_code}", response=response)
+        users_breaker.record_success()
+        if response.status_code == 200:
+            token_cache.set(token, True)
+            return True
+        else :
+            token_cache.set(token, False, TOKEN_CACHE_NEGATIVE_TTL)
+            return False
@@ -0,0 +1,19 @@
+from sqlalchemy import update
+from ..models.route_version import RouteVersion
+
+ROUTE_VERSION_ID = 1
+
+class VersionService:
+
+    def get_version(self, session):
+        version = session.query(RouteVersion.version).filter(RouteVersion.id == ROUTE_VERSION_ID).scalar()
+        return version or 0
+
+    def bump_version(self, session):
+        result = session.execute(
+            update(RouteVersion)
+            .where(RouteVersion.id == ROUTE_VERSION_ID)
+            .values(version=RouteVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            session.add(RouteVersion(ROUTE_VERSION_ID, 1))
@@ -0,0 +1,121 @@
+import os
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4'))
+ZSTD_LEVEL = int(os.environ.get('COMPRESSION_ZSTD_LEVEL', '3'))
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/plain')
+
+
+class GzipCompressor:
+
+    def __init__(self):
+        self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+
+class BrotliCompressor:
+
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.finish()
+
+
+class ZstdCompressor:
+
+    def __init__(self):
+        self.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+
+COMPRESSORS = {'gzip': GzipCompressor}
+if brotli is not None:
+    COMPRESSORS['br'] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS['zstd'] = ZstdCompressor
+ENCODINGS = [encoding for encoding in ('zstd', 'br', 'gzip') if encoding in COMPRESSORS]
+
+def etag_matches(if_none_match, etag):
+    return if_none_match.contains(etag) or any(
+        if_none_match.contains(f'{etag}-{encoding}') for encoding in ENCODINGS)
+
+def compress(data, encoding):
+    compressor = COMPRESSORS[encoding]()
+    return compressor.compress(data) + compressor.flush()
+
+def compress_stream(chunks, encoding):
+    compressor = COMPRESSORS[encoding]()
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def compress_response(response):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES and response.status_code != 304:
+        return response
+    response.vary.add('Accept-Encoding')
+    if response.status_code == 304:
+        tag_matched_encoding(response)
+        return response
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    if not encoding or request.method == 'HEAD' or 'Content-Encoding' in response.headers:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < MIN_SIZE:
+            return response
+        response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    tag_encoding(response, encoding)
+    return response
+
+def tag_encoding(response, encoding):
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+
+def tag_matched_encoding(response):
+    etag, weak = response.get_etag()
+    if not etag or request.if_none_match.contains(etag):
+        return
+    for encoding in ENCODINGS:
+        if request.if_none_match.contains(f'{etag}-{encoding}'):
+            response.set_etag(f'{etag}-{encoding}', weak)
+            return
+
+def init_app(app):
+    if COMPRESSION_ENABLED:
+        app.after_request(compress_response)
@@ -0,0 +1,51 @@
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from flask.json.provider import JSONProvider
+from .timing import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class FastJSONProvider(JSONProvider):
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        if not kwargs:
+            return dumps(obj).decode('utf-8')
+        kwargs.setdefault('default', default)
+        kwargs.setdefault('ensure_ascii', False)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if not kwargs:
+            return loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        with timed('serialize'):
+            body = dumps(obj) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
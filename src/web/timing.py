@@ -0,0 +1,133 @@
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            cumulative = []
+            total = 0
+            for count in self.counts:
+                total += count
+                cumulative.append(total)
+            return cumulative, self.sum, self.count
+
+
+class PhaseMetrics:
+
+    def __init__(self):
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, phase, seconds):
+        key = (endpoint, phase)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        histogram.observe(seconds)
+
+    def render(self, name='routes_request_phase_seconds'):
+        lines = [
+            f'# HELP {name} Duración de cada fase de las solicitudes HTTP.',
+            f'# TYPE {name} histogram'
+        ]
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+        for (endpoint, phase), histogram in histograms:
+            labels = f'endpoint="{escape_label(endpoint)}",phase="{phase}"'
+            cumulative, total, count = histogram.snapshot()
+            for bound, value in zip(histogram.buckets + ('+Inf',), cumulative):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {value}')
+            lines.append(f'{name}_sum{{{labels}}} {total}')
+            lines.append(f'{name}_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self.histograms = {}
+
+phase_metrics = PhaseMetrics()
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def record(phase, seconds):
+    if has_request_context():
+        timings = g.setdefault('timings', {})
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+@contextmanager
+def timed(phase):
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, time.perf_counter() - started_at)
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started_at', []).append(time.perf_counter())
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started_at')
+    if started:
+        record('db', time.perf_counter() - started.pop())
+
+def request_endpoint():
+    rule = request.url_rule.rule if request.url_rule else 'unmatched'
+    return f'{request.method} {rule}'
+
+def start_request():
+    g.request_started_at = time.perf_counter()
+
+def add_server_timing(response):
+    timings = dict(g.get('timings', {}))
+    started_at = g.get('request_started_at')
+    if started_at is not None:
+        timings['total'] = time.perf_counter() - started_at
+    if timings:
+        response.headers['Server-Timing'] = ', '.join(
+            f'{phase};dur={seconds * 1000:.2f}' for phase, seconds in timings.items())
+    return response
+
+def observe_request(exception=None):
+    started_at = g.get('request_started_at')
+    if started_at is None:
+        return
+    endpoint = request_endpoint()
+    for phase, seconds in g.get('timings', {}).items():
+        phase_metrics.observe(endpoint, phase, seconds)
+    phase_metrics.observe(endpoint, 'total', time.perf_counter() - started_at)
+
+def init_app(app):
+    if not event.contains(Engine, 'before_cursor_execute', before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+    app.before_request(start_request)
+    app.after_request(add_server_timing)
+    app.teardown_request(observe_request)
@@ -0,0 +1,28 @@
+import unittest
+from unittest.mock import patch
+import app as app_module
+
+
+class TestApp(unittest.TestCase):
+
+    @patch('src.database.database.Database.create_all')
+    def test_create_app_does_not_touch_the_database(self, mock_create_all):
+        # Arrange
+        # Act
+        app = app_module.create_app()
+        # Assert
+        self.assertIn('route.get_routes', app.view_functions)
+        mock_create_all.assert_not_called()
+
+    @patch('src.database.database.Database.create_all')
+    def test_init_db_command_bootstraps_schema(self, mock_create_all):
+        # Arrange
+        runner = app_module.create_app().test_cli_runner()
+        # Act
+        result = runner.invoke(args=['init-db'])
+        # Assert
+        self.assertEqual(result.exit_code, 0)
+        mock_create_all.assert_called_once_with()
+
+if __name__ == '__main__':
+    unittest.main()
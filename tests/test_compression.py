@@ -0,0 +1,101 @@
+import gzip
+import unittest
+from flask import Flask, Response, jsonify, request
+from src.web import compression
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        compression.init_app(self.app)
+        routes = [{"sourceCountry": "Colombia", "destinyCountry": "Estados Unidos"}] * 200
+
+        @self.app.route('/large')
+        def large():
+            response = jsonify(routes)
+            response.set_etag('routes-1')
+            return response
+
+        @self.app.route('/small')
+        def small():
+            return jsonify({"msg": "ok"})
+
+        @self.app.route('/stream')
+        def stream():
+            return Response((b'{"id":%d}\n' % i for i in range(500)), mimetype='application/x-ndjson')
+
+        @self.app.route('/conditional')
+        def conditional():
+            if compression.etag_matches(request.if_none_match, 'routes-1'):
+                response = Response(status=304)
+                response.set_etag('routes-1')
+                return response
+            return large()
+
+        @self.app.route('/conditional-small')
+        def conditional_small():
+            if compression.etag_matches(request.if_none_match, 'route-1'):
+                response = Response(status=304)
+            else:
+                response = small()
+            response.set_etag('route-1')
+            return response
+
+        self.client = self.app.test_client()
+        self.headers = {'Accept-Encoding': 'gzip'}
+
+    def test_large_response_is_gzipped(self):
+        # Arrange
+        # Act
+        response = self.client.get('/large', headers=self.headers)
+        # Assert
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(response.headers['ETag'], '"routes-1-gzip"')
+        self.assertTrue(gzip.decompress(response.data).startswith(b'[{"destinyCountry"'))
+
+    def test_small_response_is_not_compressed(self):
+        # Arrange
+        # Act
+        response = self.client.get('/small', headers=self.headers)
+        # Assert
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_response_without_accept_encoding_is_not_compressed(self):
+        # Arrange
+        # Act
+        response = self.client.get('/large')
+        # Assert
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_streamed_response_is_gzipped(self):
+        # Arrange
+        # Act
+        response = self.client.get('/stream', headers=self.headers)
+        # Assert
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(len(gzip.decompress(response.data).splitlines()), 500)
+
+    def test_encoded_etag_is_recognised(self):
+        # Arrange
+        headers = dict(self.headers, **{'If-None-Match': '"routes-1-gzip"'})
+        # Act
+        response = self.client.get('/conditional', headers=headers)
+        # Assert
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], '"routes-1-gzip"')
+
+    def test_not_modified_keeps_etag_of_uncompressed_response(self):
+        # Arrange
+        etag = self.client.get('/conditional-small', headers=self.headers).headers['ETag']
+        headers = dict(self.headers, **{'If-None-Match': etag})
+        # Act
+        response = self.client.get('/conditional-small', headers=headers)
+        # Assert
+        self.assertEqual(etag, '"route-1"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+
+if __name__ == '__main__':
+    unittest.main()
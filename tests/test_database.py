@@ -0,0 +1,149 @@
+import os
+import unittest
+from unittest.mock import patch
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from src.database.database import Database
+from src.database.instrumentation import QueryInstrumentation
+
+
+class TestDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.database = Database()
+        self.database.build('sqlite:///:memory:')
+
+    def tearDown(self):
+        self.database.remove_session()
+
+    def test_get_session_is_scoped(self):
+        # Arrange
+        # Act
+        first = self.database.get_session()
+        second = self.database.get_session()
+        # Assert
+        self.assertIs(first, second)
+
+    def test_remove_session_discards_session(self):
+        # Arrange
+        first = self.database.get_session()
+        # Act
+        self.database.remove_session()
+        # Assert
+        self.assertIsNot(first, self.database.get_session())
+
+    @patch.dict(os.environ, {'is_test': 'True'})
+    def test_get_session_builds_engine_lazily(self):
+        # Arrange
+        database = Database()
+        # Act
+        session = database.get_session()
+        # Assert
+        self.assertEqual(str(session.get_bind().url), 'sqlite:///:memory:')
+        database.remove_session()
+
+    def test_engine_options_for_postgresql(self):
+        # Arrange
+        # Act
+        options = self.database.get_engine_options('postgresql://u:p@localhost:5432/db')
+        # Assert
+        self.assertIn("pool_size", options)
+        self.assertIn("max_overflow", options)
+        self.assertTrue(options["pool_pre_ping"])
+
+    def test_engine_options_for_sqlite(self):
+        # Arrange
+        # Act
+        options = self.database.get_engine_options('sqlite:///:memory:')
+        # Assert
+        self.assertEqual(options, {})
+
+    def test_instrumentation_logs_slow_queries_and_query_bursts(self):
+        # Arrange
+        database = Database(QueryInstrumentation(slow_query_ms=0, max_queries_per_request=2))
+        database.build('sqlite:///:memory:')
+        app = Flask(__name__)
+        database.init_app(app)
+
+        @app.route('/burst')
+        def burst():
+            session = database.get_session()
+            for _ in range(3):
+                session.execute(text('SELECT 1'))
+            return 'ok'
+        # Act
+        with self.assertLogs('src.database.instrumentation', level='WARNING') as logs:
+            app.test_client().get('/burst')
+        # Assert
+        self.assertEqual(sum('Consulta lenta' in line for line in logs.output), 3)
+        self.assertTrue(any('GET /burst ejecutó 3 consultas' in line for line in logs.output))
+
+    def test_read_sessions_round_robin_over_replicas(self):
+        # Arrange
+        database = Database()
+        database.build('sqlite:///:memory:', ['sqlite:///:memory:', 'sqlite:///:memory:'])
+        binds = []
+        # Act
+        for _ in range(3):
+            binds.append(database.get_read_session().get_bind())
+            database.remove_session()
+        # Assert
+        self.assertEqual(binds, [database.replicas[0], database.replicas[1], database.replicas[0]])
+
+    def test_read_after_write_uses_primary(self):
+        # Arrange
+        database = Database()
+        database.build('sqlite:///:memory:', ['sqlite:///:memory:'])
+        app = Flask(__name__)
+        database.init_app(app)
+
+        @app.route('/write', methods=['POST'])
+        def write():
+            session = database.get_session()
+            session.execute(text('SELECT 1'))
+            same_request = database.get_read_session() is session
+            session.commit()
+            return str(same_request)
+
+        @app.route('/read')
+        def read():
+            return 'primary' if database.get_read_session().get_bind() is database.engine else 'replica'
+        writer = app.test_client()
+        # Act
+        same_request = writer.post('/write').text
+        after_write = writer.get('/read').text
+        other_client = app.test_client().get('/read').text
+        # Assert
+        self.assertEqual(same_request, 'True')
+        self.assertEqual(after_write, 'primary')
+        self.assertEqual(other_client, 'replica')
+
+    def test_failed_replica_is_skipped_until_cooldown(self):
+        # Arrange
+        database = Database()
+        database.build('sqlite:///:memory:', ['sqlite:////nonexistent/dir/replica.db', 'sqlite:///:memory:'])
+        # Act
+        with self.assertRaises(OperationalError):
+            database.get_read_session().execute(text('SELECT 1'))
+        database.remove_session()
+        binds = []
+        for _ in range(2):
+            binds.append(database.get_read_session().get_bind())
+            database.remove_session()
+        # Assert
+        self.assertEqual(binds, [database.replicas[1], database.replicas[1]])
+
+    def test_failed_replica_read_is_retried_on_primary(self):
+        # Arrange
+        database = Database()
+        database.build('sqlite:///:memory:', ['sqlite:////nonexistent/dir/replica.db'])
+        # Act
+        result = database.read(lambda session: session.execute(text('SELECT 1')).scalar())
+        # Assert
+        self.assertEqual(result, 1)
+        self.assertGreater(database.replica_down_until[0], 0)
+        database.remove_session()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import threading
+import unittest
+from sqlalchemy.exc import DataError, OperationalError
+from src.services.group_commit import GroupCommitWriter
+
+
+class TestGroupCommitWriter(unittest.TestCase):
+
+    def test_concurrent_items_share_one_flush(self):
+        # Arrange
+        batches = []
+
+        def flush(items):
+            batches.append(list(items))
+            return [item % 2 == 0 for item in items]
+        writer = GroupCommitWriter(flush, max_batch=10, max_delay=0.5)
+        # Act
+        futures = [writer.submit(item) for item in range(4)]
+        results = [future.result(5) for future in futures]
+        # Assert
+        self.assertEqual(batches, [[0, 1, 2, 3]])
+        self.assertEqual(results, [True, False, True, False])
+        self.assertEqual((writer.batches, writer.items), (1, 4))
+
+    def test_flushes_when_batch_is_full(self):
+        # Arrange
+        batches = []
+        release = threading.Event()
+
+        def flush(items):
+            release.wait(5)
+            batches.append(len(items))
+            return [True] * len(items)
+        writer = GroupCommitWriter(flush, max_batch=2, max_delay=5)
+        # Act
+        futures = [writer.submit(item) for item in range(4)]
+        release.set()
+        for future in futures:
+            future.result(5)
+        # Assert
+        self.assertEqual(batches, [2, 2])
+
+    def test_flush_errors_reach_every_caller(self):
+        # Arrange
+        def flush(items):
+            raise RuntimeError('sin conexión')
+        writer = GroupCommitWriter(flush, max_batch=10, max_delay=0.05)
+        futures = [writer.submit(item) for item in range(2)]
+        # Act / Assert
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(5)
+        self.assertEqual(writer.submit(1).exception(5).args, ('sin conexión',))
+
+    def test_failed_batch_only_fails_the_offending_item(self):
+        # Arrange
+        batches = []
+
+        def flush(items):
+            batches.append(list(items))
+            if 'malo' in items:
+                raise DataError('INSERT', {}, Exception('trayecto inválido'))
+            return [True] * len(items)
+        writer = GroupCommitWriter(flush, max_batch=10, max_delay=0.5)
+        # Act
+        futures = [writer.submit(item) for item in ('bueno', 'malo', 'otro')]
+        # Assert
+        self.assertTrue(futures[0].result(5))
+        self.assertIsInstance(futures[1].exception(5), DataError)
+        self.assertTrue(futures[2].result(5))
+        self.assertEqual(batches, [['bueno', 'malo', 'otro'], ['bueno'], ['malo'], ['otro']])
+
+    def test_operational_errors_fail_the_whole_batch_without_retries(self):
+        # Arrange
+        calls = []
+
+        def flush(items):
+            calls.append(list(items))
+            raise OperationalError('INSERT', {}, Exception('sin conexión'))
+        writer = GroupCommitWriter(flush, max_batch=10, max_delay=0.5)
+        # Act
+        futures = [writer.submit(item) for item in range(3)]
+        # Assert
+        for future in futures:
+            self.assertIsInstance(future.exception(5), OperationalError)
+        self.assertEqual(calls, [[0, 1, 2]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from flask import Flask, jsonify
+from src.web import json_provider
+from src.web.json_provider import FastJSONProvider
+
+
+class TestJSONProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = FastJSONProvider(self.app)
+
+    def test_jsonify_encodes_datetimes_as_iso_8601(self):
+        # Arrange
+        payload = {"naive": datetime(2023, 9, 1, 8, 30), "aware": datetime(2023, 9, 1, 8, 30, tzinfo=timezone.utc)}
+        # Act
+        with self.app.app_context():
+            response = jsonify(payload)
+        # Assert
+        self.assertEqual(response.json, {"naive": "2023-09-01T08:30:00", "aware": "2023-09-01T08:30:00+00:00"})
+
+    @patch('src.web.json_provider.orjson', None)
+    def test_stdlib_fallback_matches_fast_encoder(self):
+        # Arrange
+        payload = [{"id": "a", "bagCost": 50.5, "createdAt": datetime(2023, 9, 1, 8, 30, 0, 120)}]
+        # Act
+        encoded = json_provider.dumps(payload)
+        # Assert
+        self.assertEqual(encoded, b'[{"id":"a","bagCost":50.5,"createdAt":"2023-09-01T08:30:00.000120"}]')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+from src.models.route import Route
+
+
+class TestRouteModel(unittest.TestCase):
+
+    def test_postgresql_uses_native_uuid_and_timestamptz(self):
+        # Arrange
+        # Act
+        ddl = str(CreateTable(Route.__table__).compile(dialect=postgresql.dialect()))
+        # Assert
+        self.assertIn('id UUID NOT NULL', ddl)
+        self.assertIn('"plannedStartDate" TIMESTAMP WITH TIME ZONE', ddl)
+        self.assertIn('"createdAt" TIMESTAMP WITH TIME ZONE', ddl)
+
+    def test_sqlite_falls_back_to_strings(self):
+        # Arrange
+        # Act
+        ddl = str(CreateTable(Route.__table__).compile(dialect=sqlite.dialect()))
+        # Assert
+        self.assertIn('id VARCHAR NOT NULL', ddl)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,10 @@ import unittest
 from unittest.mock import MagicMock, patch
 from flask import Flask
 from src.controllers.reset import reset_blueprint, get_session
+from src.models.route import Route
+from src.models.route_stats import RouteStats
+from src.services.route_service import route_cache
+from src.web.timing import phase_metrics
 
 class TestReset(unittest.TestCase):
 
@@ -20,11 +24,31 @@ class TestReset(unittest.TestCase):
         response = self.client.post('/routes/reset')
         # Assert
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json, {"msg": "Todos los datos fueron eliminados"})
+        self.assertEqual(response.json["msg"], "Todos los datos fueron eliminados")
+        self.assertIn("durationMs", response.json)
 
         mock_Session.assert_called_once()
-        mock_query_delete.assert_called_once_with()
+        self.assertEqual([call.args for call in mock_session_instance.query.call_args_list], [(Route,), (RouteStats,)])
+        self.assertEqual(mock_query_delete.call_count, 2)
         mock_commit.assert_called_once_with()
+        mock_session_instance.execute.assert_called_once()
+
+    @patch('src.controllers.reset.get_session')
+    def test_reset_truncates_on_postgresql(self, mock_Session):
+        # Arrange
+        mock_session_instance = mock_Session.return_value
+        mock_session_instance.get_bind.return_value.dialect.name = 'postgresql'
+        route_cache.set('cached-route', {"id": "cached-route"})
+        phase_metrics.observe('GET /routes', 'db', 0.01)
+        # Act
+        response = self.client.post('/routes/reset')
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        statement = mock_session_instance.execute.call_args_list[0].args[0]
+        self.assertEqual(str(statement), 'TRUNCATE TABLE route, route_stats')
+        mock_session_instance.query.return_value.delete.assert_not_called()
+        self.assertIsNone(route_cache.get('cached-route'))
+        self.assertEqual(phase_metrics.histograms, {})
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -3,12 +3,17 @@ import unittest
 from unittest.mock import patch
 from datetime import datetime, timedelta
 import uuid
+import requests
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DataError
 from src.controllers.route import route_blueprint
+from src.services.circuit_breaker import CircuitOpenError
 from src.models.route import Route
 from flask import Flask, jsonify
 import json
 from src.database import database
+from concurrent.futures import Future
+from src.services.route_service import RouteService, route_cache, route_writer
 
 
 class TestRoute(unittest.TestCase):
@@ -18,6 +23,8 @@ class TestRoute(unittest.TestCase):
         self.engine = create_engine('sqlite:///:memory:')
         database.db.create_all()
         self.session = database.db.Session()
+        route_cache.clear()
+        route_cache.reset_stats()
 
         self.app = Flask(__name__)
         self.app.register_blueprint(route_blueprint)
@@ -46,6 +53,29 @@ class TestRoute(unittest.TestCase):
         self.assertEqual(response.status_code, 403) 
 
 
+    @patch('src.services.user_service.UserService.get_user_me',
+           side_effect=CircuitOpenError("El circuito 'users' está abierto"))
+    def test_users_service_unavailable(self, mock_user):
+        # Arrange
+        guid = str(uuid.uuid4())
+        # Act
+        responses = [
+            self.client.post('/routes', json={}, headers=self.headers),
+            self.client.post('/routes/batch', json=[], headers=self.headers),
+            self.client.get('/routes', headers=self.headers),
+            self.client.get('/routes/stats', headers=self.headers),
+            self.client.get(f'/routes/{guid}', headers=self.headers),
+            self.client.delete(f'/routes/{guid}', headers=self.headers)
+        ]
+        mock_user.side_effect = requests.ConnectionError()
+        responses.append(self.client.get('/routes', headers=self.headers))
+        mock_user.side_effect = requests.HTTPError()
+        responses.append(self.client.get('/routes', headers=self.headers))
+        # Assert
+        for response in responses:
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.json, {"error": "El servicio de usuarios no está disponible"})
+
     @patch('src.services.user_service.UserService.get_user_me',
            return_value= ("ok", 200))
     def test_create_route_success(self, mock_user):
@@ -85,6 +115,31 @@ class TestRoute(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(
             response.json, {'error': "El campo 'flightId' es obligatorio"})
+    @patch('src.services.user_service.UserService.get_user_me',
+           return_value= ("ok", 200))
+    def test_create_route_invalid_field_types(self, mock_user):
+        # Arrange
+        route = {
+            "flightId": "FL123",
+            "sourceAirportCode": "ABC",
+            "sourceCountry": "CountryA",
+            "destinyAirportCode": "XYZ",
+            "destinyCountry": "CountryB",
+            "bagCost": 50,
+            "plannedStartDate": (datetime.now() + timedelta(days=1)).isoformat(),
+            "plannedEndDate": (datetime.now() + timedelta(days=2)).isoformat()
+        }
+        # Act
+        null_code = self.client.post('/routes', json=dict(route, sourceAirportCode=None), headers=self.headers)
+        text_cost = self.client.post('/routes', json=dict(route, bagCost="abc"), headers=self.headers)
+        created = self.client.post('/routes', json=route, headers=self.headers)
+        # Assert
+        self.assertEqual(null_code.status_code, 400)
+        self.assertEqual(null_code.json, {"error": "El campo 'sourceAirportCode' debe ser un texto"})
+        self.assertEqual(text_cost.status_code, 400)
+        self.assertEqual(text_cost.json, {"error": "El campo 'bagCost' debe ser numérico"})
+        self.assertEqual(created.status_code, 201)
+
     @patch('src.services.user_service.UserService.get_user_me',
            return_value= ("ok", 200))
     def test_create_route_flightId_exists(self, mock_user):
@@ -115,6 +170,102 @@ class TestRoute(unittest.TestCase):
         self.assertEqual(response.status_code, 412)
         self.assertEqual(response.json, {"msg": "El flightId ya existe"})
 
+    @patch('src.services.route_service.WRITE_MODE', 'group')
+    @patch('src.services.user_service.UserService.get_user_me',
+           return_value= ("ok", 200))
+    def test_create_route_group_commit(self, mock_user):
+        # Arrange
+        def commit_now(row):
+            future = Future()
+            future.set_result(RouteService().commit_routes([row])[0])
+            return future
+        route = {
+            "flightId": "FL123",
+            "sourceAirportCode": "ABC",
+            "sourceCountry": "CountryA",
+            "destinyAirportCode": "XYZ",
+            "destinyCountry": "CountryB",
+            "bagCost": 50,
+            "plannedStartDate": (datetime.now() + timedelta(days=1)).isoformat(),
+            "plannedEndDate": (datetime.now() + timedelta(days=2)).isoformat()
+        }
+        # Act
+        with patch.object(route_writer, 'submit', side_effect=commit_now) as mock_submit:
+            created = self.client.post('/routes', json=route, headers=self.headers)
+            duplicated = self.client.post('/routes', json=route, headers=self.headers)
+        # Assert
+        self.assertEqual(mock_submit.call_count, 2)
+        self.assertEqual(created.status_code, 201)
+        self.assertIn('id', created.json)
+        self.assertEqual(duplicated.status_code, 412)
+        self.assertEqual(duplicated.json, {"msg": "El flightId ya existe"})
+
+    def test_commit_routes_rejects_duplicates_within_a_batch(self):
+        # Arrange
+        start = datetime.now() + timedelta(days=1)
+        rows = [dict(id=str(uuid.uuid4()), flightId="FL123", sourceAirportCode="ABC", sourceCountry="CountryA",
+                     destinyAirportCode="XYZ", destinyCountry="CountryB", bagCost=50, plannedStartDate=start,
+                     plannedEndDate=start + timedelta(days=1), createdAt=start, updateAt=start) for _ in range(2)]
+        # Act
+        created = RouteService().commit_routes(rows)
+        # Assert
+        self.assertEqual(created, [True, False])
+
+    @patch('src.services.user_service.UserService.get_user_me',
+           return_value= ("ok", 200))
+    def test_get_routes_stats(self, mock_user):
+        # Arrange
+        def route(flight_id, source, destiny, bag_cost):
+            return {
+                "flightId": flight_id,
+                "sourceAirportCode": source,
+                "sourceCountry": "CountryA",
+                "destinyAirportCode": destiny,
+                "destinyCountry": "CountryB",
+                "bagCost": bag_cost,
+                "plannedStartDate": (datetime.now() + timedelta(days=1)).isoformat(),
+                "plannedEndDate": (datetime.now() + timedelta(days=2)).isoformat()
+            }
+        created = self.client.post('/routes', json=route("FL1", "ABC", "XYZ", 50), headers=self.headers)
+        self.client.post('/routes/batch', json=[route("FL2", "ABC", "XYZ", 100), route("FL3", "DEF", "XYZ", 20)], headers=self.headers)
+        self.client.post('/routes/batch', json=[route("FL4", "DEF", "XYZ", 40)], headers=self.headers)
+        self.client.delete(f'/routes/{created.json["id"]}', headers=self.headers)
+        self.client.delete(f'/routes/{self.client.get("/routes?flight=FL4", headers=self.headers).json[0]["id"]}', headers=self.headers)
+        # Act
+        response = self.client.get('/routes/stats', headers=self.headers)
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [
+            {"sourceAirportCode": "ABC", "destinyAirportCode": "XYZ", "count": 1, "averageBagCost": 100.0},
+            {"sourceAirportCode": "DEF", "destinyAirportCode": "XYZ", "count": 1, "averageBagCost": 20.0}
+        ])
+        self.assertEqual(self.client.get('/routes/stats', headers={**self.headers, 'If-None-Match': response.headers['ETag']}).status_code, 304)
+
+    @patch('src.services.user_service.UserService.get_user_me',
+           return_value= ("ok", 200))
+    def test_delete_route_updates_stats_once(self, mock_user):
+        # Arrange
+        route = {
+            "sourceAirportCode": "ABC",
+            "sourceCountry": "CountryA",
+            "destinyAirportCode": "XYZ",
+            "destinyCountry": "CountryB",
+            "bagCost": 50,
+            "plannedStartDate": (datetime.now() + timedelta(days=1)).isoformat(),
+            "plannedEndDate": (datetime.now() + timedelta(days=2)).isoformat()
+        }
+        created = self.client.post('/routes', json=dict(route, flightId="DEL001"), headers=self.headers)
+        self.client.post('/routes', json=dict(route, flightId="DEL002"), headers=self.headers)
+        # Act
+        first = self.client.delete(f'/routes/{created.json["id"]}', headers=self.headers)
+        second = RouteService().delete_route(created.json["id"])
+        # Assert
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(second)
+        self.assertEqual(self.client.get('/routes/stats', headers=self.headers).json, [
+            {"sourceAirportCode": "ABC", "destinyAirportCode": "XYZ", "count": 1, "averageBagCost": 50.0}
+        ])
+
     @patch('src.services.user_service.UserService.get_user_me',
            return_value= ("ok", 200))
     def test_create_route_invalid_dates(self, mock_user):
@@ -135,6 +286,84 @@ class TestRoute(unittest.TestCase):
         self.assertEqual(
             response.json, {"msg": "Las fechas del trayecto no son válidas"})
 
+    @patch('src.services.user_service.UserService.get_user_me',
+           return_value= ("ok", 200))
+    def test_create_routes_batch(self, mock_user):
+        # Arrange
+        route = {
+            "flightId": "BAT001",
+            "sourceAirportCode": "ABC",
+            "sourceCountry": "CountryA",
+            "destinyAirportCode": "XYZ",
+            "destinyCountry": "CountryB",
+            "bagCost": 50,
+            "plannedStartDate": (datetime.now() + timedelta(days=1)).isoformat(),
+            "plannedEndDate": (datetime.now() + timedelta(days=2)).isoformat()
+        }
+        self.client.post('/routes', json=dict(route, flightId="BAT000"), headers=self.headers)
+        items = [
+            route,
+            dict(route),
+            dict(route, flightId="BAT000"),
+            {"flightId": "BAT002"},
+            dict(route, flightId="BAT003", plannedStartDate="not-a-date")
+        ]
+        # Act
+        response = self.client.post('/routes/batch', json=items, headers=self.headers)
+        results = response.json["results"]
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["status"] for result in results], [201, 412, 412, 400, 400])
+        self.assertEqual(len(self.client.get('/routes', headers=self.headers).json), 2)
+
+    @patch('src.services.user_service.UserService.get_user_me',
+           return_value= ("ok", 200))
+    def test_create_routes_batch_isolates_rows_failing_on_insert(self, mock_user):
+        # Arrange
+        route = {
+            "sourceAirportCode": "ABC",
+            "sourceCountry": "CountryA",
+            "destinyAirportCode": "XYZ",
+            "destinyCountry": "CountryB",
+            "bagCost": 50,
+            "plannedStartDate": (datetime.now() + timedelta(days=1)).isoformat(),
+            "plannedEndDate": (datetime.now() + timedelta(days=2)).isoformat()
+        }
+        insert_routes = RouteService.insert_routes
+
+        def reject_bad_rows(service, session, rows):
+            if any(row["flightId"] == "BAD001" for row in rows):
+                raise DataError("INSERT", {}, Exception("valor fuera de rango"))
+            return insert_routes(service, session, rows)
+        items = [dict(route, flightId="OK0001"), dict(route, flightId="BAD001"), dict(route, flightId="OK0002"), dict(route, bagCost="abc", flightId="OK0003")]
+        # Act
+        with patch.object(RouteService, 'insert_routes', autospec=True, side_effect=reject_bad_rows):
+            response = self.client.post('/routes/batch', json=items, headers=self.headers)
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["status"] for result in response.json["results"]], [201, 400, 201, 400])
+        self.assertEqual(len(self.client.get('/routes', headers=self.headers).json), 2)
+
+    @patch('src.services.user_service.UserService.get_user_me',
+           return_value= ("ok", 200))
+    def test_create_routes_batch_ndjson(self, mock_user):
+        # Arrange
+        lines = [json.dumps({
+            "flightId": f"NDB00{i}",
+            "sourceAirportCode": "ABC",
+            "sourceCountry": "CountryA",
+            "destinyAirportCode": "XYZ",
+            "destinyCountry": "CountryB",
+            "bagCost": 50,
+            "plannedStartDate": (datetime.now() + timedelta(days=1)).isoformat(),
+            "plannedEndDate": (datetime.now() + timedelta(days=2)).isoformat()
+        }) for i in range(2)] + ["{not json"]
+        # Act
+        response = self.client.post('/routes/batch', data='\n'.join(lines),
+                                    content_type='application/x-ndjson', headers=self.headers)
+        # Assert
+        self.assertEqual([result["status"] for result in response.json["results"]], [201, 201, 400])
+
     def test_get_routes_invalid_token(self):
         # Arrange 
         invalid_uuid = 'invalid_uuid'
@@ -241,6 +470,136 @@ class TestRoute(unittest.TestCase):
         # Assert
         self.assertEqual(response.status_code, 200)
 
+    @patch('src.services.user_service.UserService.get_user_me',
+        return_value= ("ok", 200))
+    def test_get_routes_paginated(self, mock_user):
+        # Arrange
+        guids = sorted(str(uuid.uuid4()) for _ in range(3))
+        for i, guid in enumerate(guids):
+            self.session.add(Route(
+                guid,
+                f"PAG00{i}",
+                "AAA",
+                "AAA",
+                "BBB",
+                "AAA",
+                50,
+                datetime.now(),
+                datetime.now(),
+                datetime.now(),
+                datetime.now()
+            ))
+        self.session.commit()
+        # Act
+        first_page = self.client.get('/routes?limit=2', headers=self.headers).json
+        second_page = self.client.get(f'/routes?limit=2&after={first_page["next"]}', headers=self.headers).json
+        # Assert
+        self.assertEqual([route["id"] for route in first_page["routes"]], guids[:2])
+        self.assertEqual(first_page["next"], guids[1])
+        self.assertEqual([route["id"] for route in second_page["routes"]], guids[2:])
+        self.assertIsNone(second_page["next"])
+
+    @patch('src.services.user_service.UserService.get_user_me',
+        return_value= ("ok", 200))
+    def test_get_routes_paginated_invalid_limit(self, mock_user):
+        # Arrange
+        # Act
+        response = self.client.get('/routes?limit=0', headers=self.headers)
+        # Assert
+        self.assertEqual(response.status_code, 400)
+
+    @patch('src.services.user_service.UserService.get_user_me',
+        return_value= ("ok", 200))
+    def test_get_routes_ndjson_stream(self, mock_user):
+        # Arrange
+        for flight_id in ("NDJ001", "NDJ002"):
+            self.session.add(Route(
+                str(uuid.uuid4()),
+                flight_id,
+                "AAA",
+                "AAA",
+                "BBB",
+                "AAA",
+                50,
+                datetime.now(),
+                datetime.now(),
+                datetime.now(),
+                datetime.now()
+            ))
+        self.session.commit()
+        headers = dict(self.headers, Accept='application/x-ndjson')
+        # Act
+        response = self.client.get('/routes', headers=headers)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(sorted(line["flightId"] for line in lines), ["NDJ001", "NDJ002"])
+
+    @patch('src.services.user_service.UserService.get_user_me',
+        return_value= ("ok", 200))
+    def test_get_routes_etag(self, mock_user):
+        # Arrange
+        etag = self.client.get('/routes', headers=self.headers).headers['ETag']
+        headers = dict(self.headers, **{'If-None-Match': etag})
+        # Act
+        unchanged = self.client.get('/routes', headers=headers)
+        self.client.post('/routes', json={
+            "flightId": "ETA001",
+            "sourceAirportCode": "ABC",
+            "sourceCountry": "CountryA",
+            "destinyAirportCode": "XYZ",
+            "destinyCountry": "CountryB",
+            "bagCost": 50,
+            "plannedStartDate": (datetime.now() + timedelta(days=1)).isoformat(),
+            "plannedEndDate": (datetime.now() + timedelta(days=2)).isoformat()
+        }, headers=self.headers)
+        changed = self.client.get('/routes', headers=headers)
+        # Assert
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.data, b'')
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers['ETag'], etag)
+
+    @patch('src.services.user_service.UserService.get_user_me',
+        return_value= ("ok", 200))
+    def test_get_routes_with_search_filters(self, mock_user):
+        # Arrange
+        next_week = datetime(2030, 1, 7, 12, 0)
+        for flight_id, source, start in (("SRC001", "BOG", next_week),
+                                         ("SRC002", "BOG", next_week + timedelta(days=10)),
+                                         ("SRC003", "MDE", next_week)):
+            self.session.add(Route(
+                str(uuid.uuid4()),
+                flight_id,
+                source,
+                "Colombia",
+                "MIA",
+                "Estados Unidos",
+                50,
+                start,
+                start + timedelta(hours=4),
+                datetime.now(),
+                datetime.now()
+            ))
+        self.session.commit()
+        query = 'sourceAirportCode=BOG&plannedStartDateFrom=2030-01-06&plannedStartDateTo=2030-01-13'
+        # Act
+        routes = self.client.get(f'/routes?{query}', headers=self.headers).json
+        page = self.client.get(f'/routes?{query}&limit=10', headers=self.headers).json
+        # Assert
+        self.assertEqual([route["flightId"] for route in routes], ["SRC001"])
+        self.assertEqual([route["flightId"] for route in page["routes"]], ["SRC001"])
+
+    @patch('src.services.user_service.UserService.get_user_me',
+        return_value= ("ok", 200))
+    def test_get_routes_with_invalid_date_filter(self, mock_user):
+        # Arrange
+        # Act
+        response = self.client.get('/routes?plannedStartDateFrom=mañana', headers=self.headers)
+        # Assert
+        self.assertEqual(response.status_code, 400)
+
     def test_get_routes_by_invalid_token(self):
         # Arrange 
         invalid_uuid = 'invalid_uuid'
@@ -335,6 +694,74 @@ class TestRoute(unittest.TestCase):
         # Assert
         self.assertEqual(route_data.status_code, 400)
 
+    @patch('src.services.user_service.UserService.get_user_me',
+        return_value= ("ok", 200))
+    def test_get_route_by_id_cache_invalidated_on_delete(self, mock_user):
+        # Arrange
+        guid = str(uuid.uuid4())
+        self.session.add(Route(
+            guid,
+            "XYZ789",
+            "AAA",
+            "AAA",
+            "BBB",
+            "AAA",
+            50,
+            datetime.now(),
+            datetime.now(),
+            datetime.now(),
+            datetime.now()
+        ))
+        self.session.commit()
+        self.client.get(f'/routes/{guid}', headers=self.headers)
+        self.client.get(f'/routes/{guid}', headers=self.headers)
+        # Act
+        self.client.delete(f'/routes/{guid}', headers=self.headers)
+        response = self.client.get(f'/routes/{guid}', headers=self.headers)
+        # Assert
+        self.assertEqual(route_cache.stats()["hits"], 1)
+        self.assertEqual(response.status_code, 404)
+
+    @patch('src.services.user_service.UserService.get_user_me',
+           return_value= ("ok", 200))
+    def test_get_route_by_id_etag_identifies_the_route(self, mock_user):
+        # Arrange
+        guids = [str(uuid.uuid4()) for _ in range(2)]
+        for number, guid in enumerate(guids):
+            self.session.add(Route(guid, f"ETG00{number}", "AAA", "AAA", "BBB", "AAA", 50,
+                                   datetime.now(), datetime.now(), datetime.now(), datetime.now()))
+        self.session.commit()
+        etag = self.client.get(f'/routes/{guids[0]}', headers=self.headers).headers['ETag']
+        headers = dict(self.headers, **{'If-None-Match': etag})
+        # Act
+        same = self.client.get(f'/routes/{guids[0]}', headers=headers)
+        other = self.client.get(f'/routes/{guids[1]}', headers=headers)
+        invalid = self.client.get('/routes/not-a-uuid', headers=headers)
+        # Assert
+        self.assertEqual(same.status_code, 304)
+        self.assertEqual(other.status_code, 200)
+        self.assertEqual(invalid.status_code, 400)
+
+    @patch('src.services.user_service.UserService.get_user_me',
+           return_value= ("ok", 200))
+    def test_get_route_by_id_cache_hit_skips_the_database(self, mock_user):
+        # Arrange
+        guid = str(uuid.uuid4())
+        self.session.add(Route(guid, "XYZ789", "AAA", "AAA", "BBB", "AAA", 50,
+                               datetime.now(), datetime.now(), datetime.now(), datetime.now()))
+        self.session.commit()
+        first = self.client.get(f'/routes/{guid}', headers=self.headers)
+        # Act
+        with patch('src.services.route_service.db.read', side_effect=AssertionError('consulta inesperada')):
+            cached = self.client.get(f'/routes/{guid}', headers=self.headers)
+            not_modified = self.client.get(f'/routes/{guid}', headers=dict(self.headers, **{'If-None-Match': first.headers['ETag']}))
+        # Assert
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.json, first.json)
+        self.assertEqual(cached.headers['ETag'], first.headers['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(route_cache.stats()["hits"], 2)
+
     def test_delete_invalid_token(self):
         # Arrange 
         invalid_uuid = 'invalid_uuid'
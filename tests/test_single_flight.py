@@ -0,0 +1,45 @@
+import threading
+import unittest
+from src.services.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_execution(self):
+        # Arrange
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def load():
+            calls.append(1)
+            release.wait(5)
+            return 'resultado'
+
+        workers = [threading.Thread(target=lambda: results.append(flight.do('clave', load))) for _ in range(5)]
+        # Act
+        for worker in workers:
+            worker.start()
+        while flight.shared < 4:
+            threading.Event().wait(0.001)
+        release.set()
+        for worker in workers:
+            worker.join()
+        # Assert
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['resultado'] * 5)
+
+    def test_errors_are_shared_and_not_remembered(self):
+        # Arrange
+        flight = SingleFlight()
+
+        def fail():
+            raise FileNotFoundError
+        # Act / Assert
+        with self.assertRaises(FileNotFoundError):
+            flight.do('clave', fail)
+        self.assertEqual(flight.do('clave', lambda: 'ok'), 'ok')
+
+if __name__ == '__main__':
+    unittest.main()
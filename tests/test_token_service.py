@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from flask import Flask
+from src.controllers.route import is_valid_uuid
+from src.services.token_service import KeyRing, TokenService, b64encode, sign_token
+
+SECRET = b'secreto-de-pruebas'
+
+
+@patch('src.services.token_service.key_ring', KeyRing('secreto-de-pruebas,rotada:otro-secreto'))
+class TestTokenService(unittest.TestCase):
+
+    def test_verify_valid_token(self):
+        # Arrange
+        token = sign_token({"sub": "user", "exp": time.time() + 60}, SECRET)
+        # Act
+        verified = TokenService().verify(token)
+        # Assert
+        self.assertTrue(verified)
+
+    def test_verify_token_signed_with_rotated_key(self):
+        # Arrange
+        token = sign_token({"exp": time.time() + 60}, b'otro-secreto', kid='rotada', algorithm='HS512')
+        # Act
+        verified = TokenService().verify(token)
+        # Assert
+        self.assertTrue(verified)
+
+    def test_verify_rejects_bad_signature(self):
+        # Arrange
+        token = sign_token({"exp": time.time() + 60}, b'otra-clave')
+        # Act
+        verified = TokenService().verify(token)
+        # Assert
+        self.assertFalse(verified)
+
+    def test_verify_rejects_expired_token(self):
+        # Arrange
+        token = sign_token({"exp": time.time() - 3600}, SECRET)
+        # Act
+        verified = TokenService().verify(token)
+        # Assert
+        self.assertFalse(verified)
+
+    def test_verify_defers_opaque_tokens_and_unknown_keys(self):
+        # Arrange
+        unknown_kid = sign_token({"exp": time.time() + 60}, SECRET, kid='desconocida')
+        # Act
+        opaque = TokenService().verify('c4bbabb1-0000-0000-0000-000000000000')
+        unknown = TokenService().verify(unknown_kid)
+        # Assert
+        self.assertIsNone(opaque)
+        self.assertIsNone(unknown)
+
+    def test_verify_defers_headers_with_non_string_values(self):
+        # Arrange
+        claims = b64encode(json.dumps({"exp": time.time() + 60}).encode())
+        tokens = [f'{b64encode(json.dumps(header).encode())}.{claims}.firma'
+                  for header in ({"alg": {"a": 1}}, {"alg": "HS256", "kid": ["rotada"]})]
+        # Act
+        verified = [TokenService().verify(token) for token in tokens]
+        # Assert
+        self.assertEqual(verified, [None, None])
+
+    @patch('src.controllers.route.AUTH_MODE', 'hybrid')
+    @patch('src.services.user_service.UserService.get_user_me', return_value=True)
+    def test_hybrid_mode_skips_users_service_for_signed_tokens(self, mock_user):
+        # Arrange
+        token = sign_token({"exp": time.time() + 60}, SECRET)
+        # Act
+        with Flask(__name__).test_request_context():
+            signed = is_valid_uuid(token)
+            opaque = is_valid_uuid('c4bbabb1-0000-0000-0000-000000000000')
+        # Assert
+        self.assertTrue(signed)
+        self.assertTrue(opaque)
+        mock_user.assert_called_once_with('c4bbabb1-0000-0000-0000-000000000000')
+
+    @patch('src.controllers.route.AUTH_MODE', 'local')
+    @patch('src.services.user_service.UserService.get_user_me', return_value=True)
+    def test_local_mode_never_calls_users_service(self, mock_user):
+        # Arrange
+        # Act
+        with Flask(__name__).test_request_context():
+            valid = is_valid_uuid('c4bbabb1-0000-0000-0000-000000000000')
+        # Assert
+        self.assertFalse(valid)
+        mock_user.assert_not_called()
+
+
+class TestKeyRing(unittest.TestCase):
+
+    def test_reloads_key_file_when_it_changes(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'keys.json')
+            with open(path, 'w') as file:
+                json.dump({"default": "primera"}, file)
+            key_ring = KeyRing(key_file=path, refresh=0)
+            first = key_ring.get('default')
+            with open(path, 'w') as file:
+                json.dump({"default": "segunda"}, file)
+            os.utime(path, (time.time() + 10, time.time() + 10))
+            # Act
+            second = key_ring.get('default')
+        # Assert
+        self.assertEqual(first, b'primera')
+        self.assertEqual(second, b'segunda')
+
+if __name__ == '__main__':
+    unittest.main()
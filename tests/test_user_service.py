@@ -0,0 +1,160 @@
+import importlib.util
+import threading
+import unittest
+import requests
+from unittest.mock import MagicMock, patch
+from src.services import user_service
+from src.services.cache import LRUCache, RedisCache
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.services.user_service import UserService
+
+
+class TestUserService(unittest.TestCase):
+
+    def setUp(self):
+        user_service.token_cache.clear()
+        user_service.token_cache.reset_stats()
+        user_service.users_breaker.record_success()
+
+    @patch('src.services.user_service.get_users_session')
+    def test_get_user_me_caches_valid_token(self, mock_session):
+        # Arrange
+        mock_session.return_value.get.return_value = MagicMock(status_code=200)
+        # Act
+        first = UserService().get_user_me('token-ok')
+        second = UserService().get_user_me('token-ok')
+        # Assert
+        self.assertTrue(first)
+        self.assertTrue(second)
+        mock_session.return_value.get.assert_called_once()
+        self.assertEqual(user_service.token_cache.stats()["hits"], 1)
+
+    @patch('src.services.user_service.get_users_session')
+    def test_get_user_me_caches_rejected_token(self, mock_session):
+        # Arrange
+        mock_session.return_value.get.return_value = MagicMock(status_code=401)
+        # Act
+        first = UserService().get_user_me('token-bad')
+        second = UserService().get_user_me('token-bad')
+        # Assert
+        self.assertFalse(first)
+        self.assertFalse(second)
+        mock_session.return_value.get.assert_called_once()
+
+    @patch('src.services.user_service.get_users_session')
+    def test_get_user_me_does_not_cache_server_errors(self, mock_session):
+        # Arrange
+        mock_session.return_value.get.return_value = MagicMock(status_code=503)
+        # Act
+        for _ in range(2):
+            with self.assertRaises(requests.HTTPError):
+                UserService().get_user_me('token-err')
+        # Assert
+        self.assertEqual(mock_session.return_value.get.call_count, 2)
+        self.assertIsNone(user_service.token_cache.get('token-err'))
+
+    @patch('src.services.user_service.get_users_session')
+    def test_get_user_me_uses_timeouts(self, mock_session):
+        # Arrange
+        mock_session.return_value.get.return_value = MagicMock(status_code=200)
+        # Act
+        UserService().get_user_me('token-timeout')
+        # Assert
+        self.assertEqual(mock_session.return_value.get.call_args.kwargs["timeout"],
+                         (user_service.CONNECT_TIMEOUT, user_service.READ_TIMEOUT))
+
+    @patch('src.services.user_service.get_users_session')
+    def test_get_user_me_fails_fast_when_circuit_open(self, mock_session):
+        # Arrange
+        mock_session.return_value.get.side_effect = requests.ConnectionError()
+        for i in range(user_service.BREAKER_THRESHOLD):
+            with self.assertRaises(requests.ConnectionError):
+                UserService().get_user_me(f'token-{i}')
+        # Act / Assert
+        with self.assertRaises(CircuitOpenError):
+            UserService().get_user_me('token-next')
+        self.assertEqual(mock_session.return_value.get.call_count, user_service.BREAKER_THRESHOLD)
+
+    @patch('src.services.user_service.get_users_session')
+    def test_get_user_me_counts_unexpected_errors_as_failures(self, mock_session):
+        # Arrange
+        mock_session.return_value.get.side_effect = requests.exceptions.ChunkedEncodingError()
+        # Act
+        for i in range(user_service.BREAKER_THRESHOLD):
+            with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                UserService().get_user_me(f'token-{i}')
+        # Assert
+        self.assertTrue(user_service.users_breaker.is_open())
+
+    @patch('src.services.circuit_breaker.time.monotonic')
+    def test_circuit_breaker_half_open_trial(self, mock_monotonic):
+        # Arrange
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=10)
+        mock_monotonic.return_value = 100
+        breaker.record_failure()
+        # Act
+        mock_monotonic.return_value = 111
+        breaker.before_call()
+        # Assert
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_success()
+        self.assertFalse(breaker.is_open())
+
+    def test_users_sessions_are_per_thread_and_share_the_pool(self):
+        # Arrange
+        sessions = []
+        worker = threading.Thread(target=lambda: sessions.append(user_service.get_users_session()))
+        # Act
+        worker.start()
+        worker.join()
+        session = user_service.get_users_session()
+        # Assert
+        self.assertIsNot(session, sessions[0])
+        self.assertIs(session.get_adapter('http://users'), sessions[0].get_adapter('http://users'))
+
+    def test_lru_cache_evicts_least_recently_used(self):
+        # Arrange
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        # Act
+        cache.set('c', 3)
+        # Assert
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    @patch('src.services.cache.time.monotonic')
+    def test_lru_cache_expires_entries(self, mock_monotonic):
+        # Arrange
+        cache = LRUCache(max_size=2, ttl=60)
+        mock_monotonic.return_value = 100
+        cache.set('a', 1, ttl=5)
+        cache.set('b', 2)
+        # Act
+        mock_monotonic.return_value = 110
+        # Assert
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+
+    @unittest.skipUnless(importlib.util.find_spec('redis'), 'requiere el paquete redis')
+    def test_redis_cache_treats_redis_errors_as_misses(self):
+        # Arrange
+        import redis
+        cache = RedisCache('redis://localhost:1/0')
+        cache.client = MagicMock()
+        for method in (cache.client.get, cache.client.set, cache.client.delete, cache.client.scan_iter):
+            method.side_effect = redis.ConnectionError()
+        # Act
+        cache.set('a', 1)
+        cache.delete('a')
+        cache.clear()
+        value = cache.get('a')
+        # Assert
+        self.assertIsNone(value)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+if __name__ == '__main__':
+    unittest.main()